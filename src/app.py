@@ -36,7 +36,6 @@ class KubeCertsManagerApp:
         
         # Initialize components
         self.slack_client = SlackClient(self.config.get_slack_token())
-        self.slack_notifier = SlackNotifier(self.slack_client)
         self.cert_scanner = CertificateScanner(self.config.get_cert_base_path())
         # Initialize analyzer with OpenAI if enabled
         if self.config.is_openai_enabled():
@@ -46,6 +45,11 @@ class KubeCertsManagerApp:
             )
         else:
             self.cert_analyzer = CertificateAnalyzer()
+        # The notifier analyzes scan output with the same analyzer
+        self.slack_notifier = SlackNotifier(
+            self.slack_client, self.cert_analyzer,
+            compress_html=self.config.is_html_compression_enabled()
+        )
         
         logger.info("Kubernetes certificate health check app initialized successfully")
     
@@ -131,7 +135,8 @@ class KubeCertsManagerApp:
                     # Generate HTML report
                     html_path = tmppath / "test-report.html"
                     html_generator = HTMLReportGenerator()
-                    html_generator.generate_certificate_report(dummy_data, analysis, str(html_path))
+                    html_generator.generate_certificate_report(dummy_data, analysis, str(html_path),
+                                                               return_html=False)
                     
                     # Upload HTML report
                     logger.info("📤 Uploading HTML report to Slack...")
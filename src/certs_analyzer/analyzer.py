@@ -4,28 +4,221 @@ Certificate Analyzer Module
 Analyzes certificate scan results and provides insights.
 """
 
+import copy
+import hashlib
+import json
 import logging
 import os
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import cache, lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
 
+@cache
+def _load_openai():
+    """
+    Import the OpenAI client class on first use (the openai package is slow to import).
+    
+    Returns:
+        The OpenAI class, or None if the library is not installed
+    """
+    try:
+        from openai import OpenAI
+    except ImportError:
+        return None
+    return OpenAI
+
+
+# Issue text markers that make a validation issue critical rather than a warning
+_CRITICAL_ISSUE_RE = re.compile(r'expired|missing required', re.IGNORECASE)
+
+# Shared read-only stand-in for missing nested dictionaries
+_EMPTY = MappingProxyType({})
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """Working state of a single analyze_results() call."""
+    
+    overall_status: str = 'unknown'
+    critical_issues: List[Dict[str, Any]] = field(default_factory=list)
+    warnings: List[Dict[str, Any]] = field(default_factory=list)
+    recommendations: List[str] = field(default_factory=list)
+    summary: Dict[str, Any] = field(default_factory=dict)
+    certificate_details: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the analysis dictionary returned by analyze_results().
+        
+        The lists are handed over as-is rather than deep-copied.
+        
+        Returns:
+            Analysis results dictionary
+        """
+        return {
+            'overall_status': self.overall_status,
+            'critical_issues': self.critical_issues,
+            'warnings': self.warnings,
+            'recommendations': self.recommendations,
+            'summary': self.summary,
+            'certificate_details': self.certificate_details
+        }
+
+
+# Fixed structure of create_dummy_data(); timestamps are filled in per call
+_DUMMY_TEMPLATE = {
+    'scan_timestamp': None,
+    'cluster_type': 'kubeadm',
+    'certificates': [
+        {
+            'name': 'apiserver',
+            'path': '/etc/kubernetes/pki/apiserver.crt',
+            'subject': {'CN': 'kube-apiserver'},
+            'issuer': {'CN': 'kubernetes'},
+            'validity': {'not_before': None, 'not_after': None},
+            'san': {
+                'dns_names': ['kubernetes', 'kubernetes.default', 'kubernetes.default.svc'],
+                'ip_addresses': ['10.96.0.1']
+            },
+            'key_info': {'algorithm': 'RSA', 'size': '2048 bit'},
+            'status': 'expiring_soon',
+            'days_until_expiry': 30,
+            'issues': ['Certificate expires in 30 days']
+        },
+        {
+            'name': 'ca',
+            'path': '/etc/kubernetes/pki/ca.crt',
+            'subject': {'CN': 'kubernetes'},
+            'issuer': {'CN': 'kubernetes'},
+            'validity': {'not_before': None, 'not_after': None},
+            'san': {'dns_names': [], 'ip_addresses': []},
+            'key_info': {'algorithm': 'RSA', 'size': '2048 bit'},
+            'status': 'valid',
+            'days_until_expiry': 3650,
+            'issues': []
+        }
+    ],
+    'summary': {
+        'total_certificates': 2,
+        'expired': 0,
+        'expiring_soon': 1,
+        'valid': 1,
+        'missing': 0
+    }
+}
+
+# Use cases for the standard kubeadm certificates, answered without an OpenAI request
+_KNOWN_USE_CASES: Dict[str, str] = {
+    'ca': ('The cluster root certificate authority. It signs the API server, kubelet and '
+           'component client certificates, and every component trusts it to authenticate '
+           'clients of the Kubernetes API. If it expires or leaks, trust across the whole '
+           'control plane breaks.'),
+    'apiserver': ('The kube-apiserver serving certificate presented to every client over HTTPS. '
+                  'Its SANs must cover the API server service IP and DNS names so that kubectl, '
+                  'kubelets and in-cluster workloads can verify they are talking to the real API '
+                  'server.'),
+    'apiserver-kubelet-client': ('Client certificate the kube-apiserver uses to authenticate to '
+                                 'kubelets for logs, exec, port-forward and metrics. Without it '
+                                 'the API server cannot reach node-level endpoints securely.'),
+    'apiserver-etcd-client': ('Client certificate the kube-apiserver uses to authenticate to etcd. '
+                              'It protects access to the datastore holding all cluster state and '
+                              'secrets; if it expires the API server loses its backing store.'),
+    'front-proxy-ca': ('Certificate authority for the API aggregation layer. It signs the front '
+                       'proxy client certificate, and extension API servers trust it to verify '
+                       'requests forwarded by the kube-apiserver.'),
+    'front-proxy-client': ('Client certificate the kube-apiserver presents when proxying requests '
+                           'to aggregated API servers such as metrics-server. It lets extension '
+                           'API servers trust the user identity headers the API server forwards.'),
+    'etcd-ca': ('Certificate authority for etcd. It signs the etcd server, peer and client '
+                'certificates, so that only holders of its certificates can join or query the '
+                'etcd cluster.'),
+    'etcd-server': ('Serving certificate presented by etcd to its clients, chiefly the '
+                    'kube-apiserver. It encrypts and authenticates all reads and writes of '
+                    'cluster state.'),
+    'etcd-peer': ('Certificate etcd members use to authenticate and encrypt replication traffic '
+                  'with one another. An expired peer certificate breaks etcd cluster membership '
+                  'and quorum.'),
+    'etcd-healthcheck-client': ('Client certificate used by etcd liveness probes and tooling to '
+                                'query etcd health endpoints. Expiry makes the etcd static pod '
+                                'fail its health checks and restart.'),
+}
+
+# Names produced by static pod discovery for the same certificates
+_KNOWN_USE_CASES.update({
+    'kube-apiserver-server': _KNOWN_USE_CASES['apiserver'],
+    'kube-apiserver-kubelet-client': _KNOWN_USE_CASES['apiserver-kubelet-client'],
+    'kube-apiserver-etcd-client': _KNOWN_USE_CASES['apiserver-etcd-client'],
+    'kube-apiserver-front-proxy-client': _KNOWN_USE_CASES['front-proxy-client'],
+})
+
+# Maximum number of concurrent OpenAI requests
+AI_MAX_WORKERS = 16
+
+# Upper bound on completion tokens for a batched use case request
+AI_BATCH_MAX_TOKENS = 4096
+
+# Maximum number of AI use cases kept in memory per analyzer
+AI_MEMO_SIZE = 512
+
+# Default location of the on-disk AI use case cache
+DEFAULT_AI_CACHE_DIR = '~/.cache/certs_analyzer/usecase'
+
+# OpenAI client settings
+OPENAI_MAX_RETRIES = 2
+OPENAI_TIMEOUT = 15.0  # seconds
+
+
 class CertificateAnalyzer:
     """Analyzes certificate scan results."""
     
-    def __init__(self, openai_api_key: Optional[str] = None, openai_model: str = "gpt-4"):
+    def __init__(self, openai_api_key: Optional[str] = None, openai_model: str = "gpt-4o-mini",
+                 cache_dir: Optional[str] = None, stream_ai: bool = False):
         """
         Initialize the certificate analyzer.
         
         Args:
             openai_api_key: OpenAI API key (optional, for AI-powered analysis)
-            openai_model: OpenAI model to use (default: gpt-4)
+            openai_model: OpenAI model to use (default: gpt-4o-mini)
+            cache_dir: Directory for cached AI responses (default: OPENAI_CACHE_DIR
+                or ~/.cache/certs_analyzer/usecase; empty string disables the disk cache)
+            stream_ai: Stream per-certificate use case responses (default: False)
         """
         self.openai_api_key = openai_api_key or os.getenv('OPENAI_API_KEY')
         self.openai_model = openai_model
+        self.stream_ai = stream_ai
         self.openai_enabled = self.openai_api_key is not None
+        self._openai_client = None
+        # In-memory use cases by prompt hash, in front of the on-disk cache
+        self._use_case_memo = {}
+        self._use_case_memo_lock = threading.Lock()
+        
+        # Create one client up front so HTTP keep-alive reuses a single
+        # connection pool across all certificate lookups
+        if self.openai_enabled:
+            OpenAI = _load_openai()
+            if OpenAI is not None:
+                self._openai_client = OpenAI(
+                    api_key=self.openai_api_key,
+                    max_retries=OPENAI_MAX_RETRIES,
+                    timeout=OPENAI_TIMEOUT
+                )
+            else:
+                logger.warning("⚠️ OpenAI library not available. Install with: pip install openai")
+                self.openai_enabled = False
+        
+        if cache_dir is None:
+            cache_dir = os.getenv('OPENAI_CACHE_DIR', DEFAULT_AI_CACHE_DIR)
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
     
     def analyze_results(self, scan_results: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -35,124 +228,216 @@ class CertificateAnalyzer:
             scan_results: Certificate scan results dictionary
             
         Returns:
-            Analysis results with recommendations
+            Analysis results with recommendations. The structure only contains
+            str-keyed dicts, lists, strings, numbers and None (no datetimes or
+            tuples), so it can be passed straight to json/orjson.
         """
         logger.info("🔍 Analyzing certificate scan results...")
         
-        analysis = {
-            'overall_status': 'unknown',
-            'critical_issues': [],
-            'warnings': [],
-            'recommendations': [],
-            'summary': scan_results.get('summary', {}),
-            'certificate_details': []
-        }
-        
-        summary = scan_results.get('summary', {})
+        # Take a private copy so later changes to scan_results don't leak into the analysis
+        summary = dict(scan_results.get('summary') or {})
         certificates = scan_results.get('certificates', [])
+        result = AnalysisResult(summary=summary)
         
         # Determine overall status
         if summary.get('expired', 0) > 0:
-            analysis['overall_status'] = 'critical'
+            result.overall_status = 'critical'
         elif summary.get('expiring_soon', 0) > 0:
-            analysis['overall_status'] = 'warning'
+            result.overall_status = 'warning'
         elif summary.get('missing', 0) > 0:
-            analysis['overall_status'] = 'warning'
+            result.overall_status = 'warning'
         else:
-            analysis['overall_status'] = 'healthy'
+            result.overall_status = 'healthy'
         
-        # Track AI requests for summary
-        ai_requests_made = 0
-        ai_requests_successful = 0
-        ai_requests_failed = 0
+        certificate_details = result.certificate_details
+        add_detail = certificate_details.append
+        critical = result.critical_issues.append
+        warn = result.warnings.append
         
-        # Analyze each certificate
+        # Analyze each certificate in a single pass
         for cert in certificates:
-            cert_analysis = self._analyze_certificate(cert)
+            g = cert.get
+            name = g('name')
+            status = g('status')
+            days = g('days_until_expiry')
+            issues = g('issues') or ()
             
-            # Add AI-powered use case explanation if OpenAI is enabled
-            if self.openai_enabled:
-                try:
-                    ai_requests_made += 1
-                    use_case = self._get_certificate_use_case(cert)
-                    if use_case:
-                        ai_requests_successful += 1
-                        cert_analysis['use_case'] = use_case
-                        cert['use_case'] = use_case  # Also add to original cert for HTML report
-                    else:
-                        ai_requests_failed += 1
-                except Exception as e:
-                    ai_requests_failed += 1
-                    logger.warning(f"⚠️ Could not get AI use case for {cert.get('name')}: {e}")
+            add_detail({
+                'name': name,
+                'status': status,
+                'days_until_expiry': days,
+                'issues': g('issues', []),
+                'subject': g('subject', {}),
+                'issuer': g('issuer', {}),
+                'use_case': g('use_case')  # Will be populated by AI if enabled
+            })
             
-            analysis['certificate_details'].append(cert_analysis)
-        
-        # Log AI request summary if any were made
-        if ai_requests_made > 0:
-            logger.info(f"🤖 AI Analysis Summary: {ai_requests_successful}/{ai_requests_made} use cases generated successfully" + 
-                       (f" ({ai_requests_failed} failed)" if ai_requests_failed > 0 else ""))
-            
-            # Collect critical issues
-            if cert.get('status') == 'expired':
-                analysis['critical_issues'].append({
-                    'certificate': cert.get('name'),
+            # Collect critical issues and warnings from the expiry status
+            if status == 'expired':
+                critical({
+                    'certificate': name,
                     'issue': 'Certificate has expired',
-                    'expiry_date': cert.get('validity', {}).get('not_after')
+                    'expiry_date': (g('validity') or _EMPTY).get('not_after')
                 })
-            
-            # Collect warnings
-            if cert.get('status') == 'expiring_soon':
-                days = cert.get('days_until_expiry', 0)
-                analysis['warnings'].append({
-                    'certificate': cert.get('name'),
+            elif status == 'expiring_soon':
+                warn({
+                    'certificate': name,
                     'issue': f'Certificate expires in {days} days',
-                    'expiry_date': cert.get('validity', {}).get('not_after')
+                    'expiry_date': (g('validity') or _EMPTY).get('not_after')
                 })
             
             # Collect validation issues
-            for issue in cert.get('issues', []):
-                if 'expired' in issue.lower() or 'missing required' in issue.lower():
-                    analysis['critical_issues'].append({
-                        'certificate': cert.get('name'),
-                        'issue': issue
-                    })
-                else:
-                    analysis['warnings'].append({
-                        'certificate': cert.get('name'),
-                        'issue': issue
-                    })
+            for issue in issues:
+                (critical if _CRITICAL_ISSUE_RE.search(issue) else warn)({'certificate': name, 'issue': issue})
+        
+        # Add AI-powered use case explanations if OpenAI is enabled
+        if self.openai_enabled and certificates:
+            self._add_ai_use_cases(certificates, certificate_details)
         
         # Generate recommendations
-        analysis['recommendations'] = self._generate_recommendations(analysis)
+        result.recommendations = self._generate_recommendations(result)
         
-        logger.info(f"✅ Analysis complete: {analysis['overall_status']}")
+        logger.info("✅ Analysis complete: %s", result.overall_status)
         
-        return analysis
+        return result.to_dict()
     
-    def _analyze_certificate(self, cert: Dict[str, Any]) -> Dict[str, Any]:
+    def _add_ai_use_cases(self, certificates: List[Dict[str, Any]],
+                          certificate_details: List[Dict[str, Any]]) -> None:
         """
-        Analyze a single certificate.
+        Request AI use case explanations for all certificates.
+        
+        Standard kubeadm certificates are answered from a built-in table.
+        The remaining certificates without a cached response are first sent to OpenAI in a
+        single batched request. Anything the batch does not cover falls back to
+        per-certificate requests, which are dispatched on a thread pool and
+        attached as they complete.
+        
+        Args:
+            certificates: Certificate information dictionaries (updated in place)
+            certificate_details: Per-certificate analysis dictionaries (updated in place)
+        """
+        known_use_cases = 0
+        ai_requests_successful = 0
+        ai_requests_failed = 0
+        
+        # Known certificates need no request at all
+        remaining = []
+        for cert, cert_analysis in zip(certificates, certificate_details):
+            use_case = _KNOWN_USE_CASES.get(cert.get('name'))
+            if use_case:
+                known_use_cases += 1
+                cert_analysis['use_case'] = use_case
+                cert['use_case'] = use_case  # Also add to original cert for HTML report
+            else:
+                remaining.append((cert, cert_analysis))
+        
+        # Load cached responses into the memo so the per-certificate path does
+        # not read them again, and batch everything else into one request
+        uncached = []
+        for i, (cert, _) in enumerate(remaining):
+            prompt_hash = self._prompt_hash(cert)
+            use_case = self._use_case_memo.get(prompt_hash) or self._read_cached_use_case(prompt_hash)
+            if use_case is not None:
+                self._memoize_use_case(prompt_hash, use_case)
+            else:
+                uncached.append((i, prompt_hash))
+        
+        batch_use_cases = {}
+        if len(uncached) > 1:
+            # Batch answers are keyed by position, so certificates sharing a name stay apart
+            answers = self._get_certificate_use_cases_batch([remaining[i][0] for i, _ in uncached])
+            for position, use_case in answers.items():
+                i, prompt_hash = uncached[position]
+                batch_use_cases[i] = use_case
+                self._write_cached_use_case(prompt_hash, use_case)
+                self._memoize_use_case(prompt_hash, use_case)
+        
+        pending = []
+        for i, (cert, cert_analysis) in enumerate(remaining):
+            use_case = batch_use_cases.get(i)
+            if use_case:
+                ai_requests_successful += 1
+                cert_analysis['use_case'] = use_case
+                cert['use_case'] = use_case  # Also add to original cert for HTML report
+            else:
+                pending.append((cert, cert_analysis))
+        
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(AI_MAX_WORKERS, len(pending))) as executor:
+                futures = {
+                    executor.submit(self._get_certificate_use_case, cert): (cert, cert_analysis)
+                    for cert, cert_analysis in pending
+                }
+                
+                for future in as_completed(futures):
+                    cert, cert_analysis = futures[future]
+                    try:
+                        use_case = future.result()
+                        if use_case:
+                            ai_requests_successful += 1
+                            cert_analysis['use_case'] = use_case
+                            cert['use_case'] = use_case  # Also add to original cert for HTML report
+                        else:
+                            ai_requests_failed += 1
+                    except Exception as e:
+                        ai_requests_failed += 1
+                        logger.warning("⚠️ Could not get AI use case for %s: %s", cert.get('name'), e)
+        
+        # Log AI request summary; table answers are not AI requests
+        if logger.isEnabledFor(logging.INFO):
+            ai_requests_made = len(remaining)
+            logger.info(f"🤖 AI Analysis Summary: {ai_requests_successful}/{ai_requests_made} use cases generated successfully" + 
+                       (f" ({ai_requests_failed} failed)" if ai_requests_failed > 0 else "") +
+                       (f", {known_use_cases} from the built-in table" if known_use_cases else ""))
+    
+    def _build_prompt(self, cert: Dict[str, Any]) -> str:
+        """
+        Build the OpenAI prompt for a certificate.
         
         Args:
             cert: Certificate information dictionary
             
         Returns:
-            Analysis for the certificate
+            Prompt text
         """
-        return {
-            'name': cert.get('name'),
-            'status': cert.get('status'),
-            'days_until_expiry': cert.get('days_until_expiry'),
-            'issues': cert.get('issues', []),
-            'subject': cert.get('subject', {}),
-            'issuer': cert.get('issuer', {}),
-            'use_case': cert.get('use_case')  # Will be populated by AI if enabled
-        }
+        return f"""Explain the use case and purpose of this Kubernetes certificate in 2-3 sentences.
+
+Certificate Name: {cert.get('name', 'unknown')}
+Path: {cert.get('path', '')}
+Subject: {cert.get('subject', {})}
+Issuer: {cert.get('issuer', {})}
+
+Provide a clear, concise explanation of:
+1. What this certificate is used for in a Kubernetes cluster
+2. Which component(s) use it
+3. Why it's important for cluster security
+
+Keep the response brief and technical."""
+    
+    def _prompt_hash(self, cert: Dict[str, Any], prompt: Optional[str] = None) -> str:
+        """
+        Compute the cache key for a certificate's use case prompt.
+        
+        Args:
+            cert: Certificate information dictionary
+            prompt: Prebuilt prompt (built from cert if not given)
+            
+        Returns:
+            SHA-256 hex digest of the model and prompt
+        """
+        if prompt is None:
+            prompt = self._build_prompt(cert)
+        return hashlib.sha256(f"{self.openai_model}\n{prompt}".encode('utf-8')).hexdigest()
     
     def _get_certificate_use_case(self, cert: Dict[str, Any]) -> Optional[str]:
         """
         Get AI-powered explanation of certificate use case.
         
+        With OpenAI enabled, standard kubeadm certificate names are answered
+        from a built-in table. Other responses are cached by prompt hash, in-process and on disk, so
+        certificates with identical name/path/subject/issuer only cost one
+        OpenAI request.
+        
         Args:
             cert: Certificate information dictionary
             
@@ -162,92 +447,248 @@ class CertificateAnalyzer:
         if not self.openai_enabled:
             return None
         
+        known = _KNOWN_USE_CASES.get(cert.get('name'))
+        if known:
+            return known
+        
         cert_name = cert.get('name', 'unknown')
-        import time
         start_time = time.time()
         
         try:
-            from openai import OpenAI
+            logger.info("🤖 Requesting AI use case for certificate: %s", cert_name)
             
-            logger.info(f"🤖 Requesting AI use case for certificate: {cert_name}")
+            prompt = self._build_prompt(cert)
+            use_case = self._cached_call(self._prompt_hash(cert, prompt), prompt)
             
-            client = OpenAI(api_key=self.openai_api_key)
+            elapsed_time = time.time() - start_time
+            logger.info("✅ AI use case generated for '%s' in %.2fs", cert_name, elapsed_time)
             
-            subject = cert.get('subject', {})
-            issuer = cert.get('issuer', {})
-            path = cert.get('path', '')
+            return use_case
             
-            # Build prompt for OpenAI
-            prompt = f"""Explain the use case and purpose of this Kubernetes certificate in 2-3 sentences.
+        except Exception as e:
+            elapsed_time = time.time() - start_time
+            logger.error("❌ Failed to get AI use case for '%s' after %.2fs: %s", cert_name, elapsed_time, e)
+            return None
+    
+    def _get_certificate_use_cases_batch(self, certs: List[Dict[str, Any]]) -> Dict[int, str]:
+        """
+        Get AI-powered use case explanations for several certificates in one request.
+        
+        Args:
+            certs: Certificate information dictionaries
+            
+        Returns:
+            Mapping of index into certs to use case explanation (empty on failure)
+        """
+        if not self.openai_enabled or not certs:
+            return {}
+        
+        start_time = time.time()
+        
+        cert_entries = "\n".join(
+            f"- ID: {i}\n"
+            f"  Name: {cert.get('name', 'unknown')}\n"
+            f"  Path: {cert.get('path', '')}\n"
+            f"  Subject: {cert.get('subject', {})}\n"
+            f"  Issuer: {cert.get('issuer', {})}"
+            for i, cert in enumerate(certs)
+        )
+        
+        prompt = f"""Explain the use case and purpose of each of these Kubernetes certificates in 2-3 sentences.
 
-Certificate Name: {cert_name}
-Path: {path}
-Subject: {subject}
-Issuer: {issuer}
+{cert_entries}
 
-Provide a clear, concise explanation of:
+For each certificate, provide a clear, concise explanation of:
 1. What this certificate is used for in a Kubernetes cluster
 2. Which component(s) use it
 3. Why it's important for cluster security
 
-Keep the response brief and technical."""
+Keep each explanation brief and technical. Respond with a JSON object of the form
+{{"use_cases": {{"<certificate ID>": "<explanation>"}}}}."""
+        
+        try:
+            logger.info("🤖 Requesting AI use cases for %d certificates in one batch", len(certs))
             
-            response = client.chat.completions.create(
+            response = self._openai_client.chat.completions.create(
                 model=self.openai_model,
                 messages=[
                     {"role": "system", "content": "You are a Kubernetes security expert. Provide clear, concise explanations of Kubernetes certificate purposes."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=200,
-                temperature=0.3
+                max_tokens=min(200 * len(certs), AI_BATCH_MAX_TOKENS),
+                temperature=0.3,
+                response_format={"type": "json_object"}
             )
             
-            elapsed_time = time.time() - start_time
-            use_case = response.choices[0].message.content.strip()
+            use_cases = json.loads(response.choices[0].message.content or '{}').get('use_cases')
+            if not isinstance(use_cases, dict):
+                raise ValueError("response has no 'use_cases' object")
             
-            # Log success with useful information
+            results = {}
+            for key, text in use_cases.items():
+                key = str(key).strip()
+                if key.isdigit() and int(key) < len(certs) and isinstance(text, str) and text.strip():
+                    results[int(key)] = text.strip()
+            
+            elapsed_time = time.time() - start_time
             tokens_used = response.usage.total_tokens if hasattr(response, 'usage') and response.usage else 'unknown'
-            logger.info(f"✅ AI use case generated for '{cert_name}' in {elapsed_time:.2f}s (tokens: {tokens_used})")
+            logger.info("✅ AI batch returned %d/%d use cases in %.2fs (tokens: %s)", len(results), len(certs), elapsed_time, tokens_used)
             
-            return use_case
+            return results
             
-        except ImportError:
-            logger.warning("⚠️ OpenAI library not available. Install with: pip install openai")
-            return None
         except Exception as e:
             elapsed_time = time.time() - start_time
-            logger.error(f"❌ Failed to get AI use case for '{cert_name}' after {elapsed_time:.2f}s: {str(e)}")
+            logger.warning("⚠️ Batched AI request failed after %.2fs, falling back to per-certificate requests: %s", elapsed_time, e)
+            return {}
+    
+    def _cached_call(self, prompt_hash: str, prompt: str) -> str:
+        """
+        Get the use case for a prompt, checking the in-memory and on-disk
+        caches before OpenAI.
+        
+        Failures raise instead of returning None so they are never cached.
+        
+        Args:
+            prompt_hash: SHA-256 hex digest of the model and prompt
+            prompt: Prompt text
+            
+        Returns:
+            Use case explanation
+        """
+        memo = self._use_case_memo
+        use_case = memo.get(prompt_hash)
+        if use_case is not None:
+            return use_case
+        
+        use_case = self._read_cached_use_case(prompt_hash)
+        if use_case is not None:
+            logger.debug("AI use case cache hit: %s", prompt_hash[:12])
+        else:
+            use_case = self._request_use_case(prompt)
+            self._write_cached_use_case(prompt_hash, use_case)
+        
+        self._memoize_use_case(prompt_hash, use_case)
+        return use_case
+    
+    def _memoize_use_case(self, prompt_hash: str, use_case: str) -> None:
+        """Remember a use case in memory, evicting the oldest entry once full."""
+        memo = self._use_case_memo
+        # Called from worker threads; dicts keep insertion order
+        with self._use_case_memo_lock:
+            if prompt_hash not in memo and len(memo) >= AI_MEMO_SIZE:
+                memo.pop(next(iter(memo)), None)
+            memo[prompt_hash] = use_case
+    
+    def _request_use_case(self, prompt: str) -> str:
+        """
+        Request a use case explanation from OpenAI.
+        
+        Args:
+            prompt: Prompt text
+            
+        Returns:
+            Use case explanation
+        """
+        response = self._openai_client.chat.completions.create(
+            model=self.openai_model,
+            messages=[
+                {"role": "system", "content": "You are a Kubernetes security expert. Provide clear, concise explanations of Kubernetes certificate purposes."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=200,
+            temperature=0.3,
+            stream=self.stream_ai
+        )
+        
+        if self.stream_ai:
+            parts = []
+            for chunk in response:
+                if chunk.choices:
+                    parts.append(chunk.choices[0].delta.content or '')
+            use_case = ''.join(parts).strip()
+            tokens_used = 'unknown'
+        else:
+            use_case = (response.choices[0].message.content or '').strip()
+            tokens_used = response.usage.total_tokens if hasattr(response, 'usage') and response.usage else 'unknown'
+        
+        if not use_case:
+            raise ValueError("OpenAI returned an empty response")
+        
+        logger.debug("OpenAI request completed (tokens: %s)", tokens_used)
+        
+        return use_case
+    
+    def _read_cached_use_case(self, prompt_hash: str) -> Optional[str]:
+        """Read a use case from the on-disk cache, if present."""
+        if not self.cache_dir:
+            return None
+        
+        try:
+            return (self.cache_dir / f"{prompt_hash}.txt").read_text(encoding='utf-8')
+        except OSError:
             return None
     
-    def _generate_recommendations(self, analysis: Dict[str, Any]) -> List[str]:
+    def _write_cached_use_case(self, prompt_hash: str, use_case: str) -> None:
+        """Write a use case to the on-disk cache (best effort)."""
+        if not self.cache_dir:
+            return
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            (self.cache_dir / f"{prompt_hash}.txt").write_text(use_case, encoding='utf-8')
+        except OSError as e:
+            logger.debug("Could not write AI use case cache: %s", e)
+    
+    def _generate_recommendations(self, analysis: AnalysisResult) -> List[str]:
         """
         Generate recommendations based on analysis.
         
         Args:
-            analysis: Analysis results dictionary
+            analysis: Analysis result being built
             
         Returns:
             List of recommendations
         """
+        summary = analysis.summary or {}
+        return list(self._recommendations_for(
+            analysis.overall_status,
+            summary.get('expired', 0),
+            summary.get('expiring_soon', 0),
+            summary.get('missing', 0)
+        ))
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _recommendations_for(status: str, expired_count: int, expiring_count: int,
+                             missing_count: int) -> Tuple[str, ...]:
+        """
+        Build the recommendation list for a status and set of summary counts.
+        
+        Args:
+            status: Overall analysis status
+            expired_count: Number of expired certificates
+            expiring_count: Number of certificates expiring soon
+            missing_count: Number of missing certificates
+            
+        Returns:
+            Tuple of recommendations
+        """
         recommendations = []
         
-        if analysis['overall_status'] == 'critical':
+        if status == 'critical':
             recommendations.append('URGENT: Renew expired certificates immediately to prevent cluster failure')
             recommendations.append('Use "kubeadm certs renew all" to renew all certificates (kubeadm clusters)')
         
-        if analysis['overall_status'] == 'warning':
+        if status == 'warning':
             recommendations.append('Schedule certificate renewal before expiration')
             recommendations.append('Set up monitoring alerts for certificate expiration (30 days before)')
         
-        expired_count = analysis['summary'].get('expired', 0)
         if expired_count > 0:
             recommendations.append(f'Renew {expired_count} expired certificate(s) using kubeadm certs renew')
         
-        expiring_count = analysis['summary'].get('expiring_soon', 0)
         if expiring_count > 0:
             recommendations.append(f'Plan renewal for {expiring_count} certificate(s) expiring within 30 days')
         
-        missing_count = analysis['summary'].get('missing', 0)
         if missing_count > 0:
             recommendations.append(f'Investigate {missing_count} missing certificate(s) - may indicate configuration issues')
         
@@ -256,7 +697,7 @@ Keep the response brief and technical."""
         recommendations.append('Consider automating certificate renewal with kubeadm certs renew')
         recommendations.append('Document certificate renewal procedures for your cluster type')
         
-        return recommendations
+        return tuple(recommendations)
     
     def create_dummy_data(self) -> Dict[str, Any]:
         """
@@ -265,54 +706,18 @@ Keep the response brief and technical."""
         Returns:
             Dummy certificate scan results
         """
-        from datetime import timedelta
-        
         now = datetime.utcnow()
+        one_year_ago = (now - timedelta(days=365)).isoformat()
+        plus_30 = (now + timedelta(days=30)).isoformat()
+        plus_3650 = (now + timedelta(days=3650)).isoformat()
         
-        return {
-            'scan_timestamp': now.isoformat(),
-            'cluster_type': 'kubeadm',
-            'certificates': [
-                {
-                    'name': 'apiserver',
-                    'path': '/etc/kubernetes/pki/apiserver.crt',
-                    'subject': {'CN': 'kube-apiserver'},
-                    'issuer': {'CN': 'kubernetes'},
-                    'validity': {
-                        'not_before': (now - timedelta(days=365)).isoformat(),
-                        'not_after': (now + timedelta(days=30)).isoformat()
-                    },
-                    'san': {
-                        'dns_names': ['kubernetes', 'kubernetes.default', 'kubernetes.default.svc'],
-                        'ip_addresses': ['10.96.0.1']
-                    },
-                    'key_info': {'algorithm': 'RSA', 'size': '2048 bit'},
-                    'status': 'expiring_soon',
-                    'days_until_expiry': 30,
-                    'issues': ['Certificate expires in 30 days']
-                },
-                {
-                    'name': 'ca',
-                    'path': '/etc/kubernetes/pki/ca.crt',
-                    'subject': {'CN': 'kubernetes'},
-                    'issuer': {'CN': 'kubernetes'},
-                    'validity': {
-                        'not_before': (now - timedelta(days=365)).isoformat(),
-                        'not_after': (now + timedelta(days=3650)).isoformat()
-                    },
-                    'san': {'dns_names': [], 'ip_addresses': []},
-                    'key_info': {'algorithm': 'RSA', 'size': '2048 bit'},
-                    'status': 'valid',
-                    'days_until_expiry': 3650,
-                    'issues': []
-                }
-            ],
-            'summary': {
-                'total_certificates': 2,
-                'expired': 0,
-                'expiring_soon': 1,
-                'valid': 1,
-                'missing': 0
-            }
-        }
-
+        data = copy.deepcopy(_DUMMY_TEMPLATE)
+        data['scan_timestamp'] = now.isoformat()
+        
+        apiserver, ca = data['certificates']
+        apiserver['validity']['not_before'] = one_year_ago
+        apiserver['validity']['not_after'] = plus_30
+        ca['validity']['not_before'] = one_year_ago
+        ca['validity']['not_after'] = plus_3650
+        
+        return data
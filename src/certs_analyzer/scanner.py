@@ -4,14 +4,19 @@ Certificate Scanner Module
 Scans Kubernetes cluster for certificates by discovering them from static pod configurations.
 """
 
+import hashlib
 import os
 import subprocess
 import logging
 import json
+import re
 import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
 try:
     from kubernetes import client, config
@@ -23,8 +28,179 @@ except ImportError:
     logger = logging.getLogger(__name__)
     logger.warning("kubernetes library not available. Install with: pip install kubernetes")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from cryptography import x509
+    from cryptography.hazmat.primitives.asymmetric import dsa, ec, ed448, ed25519, rsa
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    CRYPTOGRAPHY_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# 'openssl x509 -text' sections that _parse_openssl_output() does not need
+OPENSSL_CERTOPT = 'no_header,no_version,no_serial,no_signame,no_sigdump,no_aux'
+
+# Single-line fields of interest in 'openssl x509 -text' output
+_OPENSSL_FIELD_RE = re.compile(
+    r'^[ \t]*(Subject|Issuer|Not Before|Not After|Public Key Algorithm|(?:RSA )?Public-Key)[ \t]*:(.*)$',
+    re.MULTILINE
+)
+
+# Body of the Subject Alternative Name extension in 'openssl x509 -text' output
+_OPENSSL_SAN_RE = re.compile(r'X509v3 Subject Alternative Name:[^\n]*\n([^\n]*)')
+_SAN_DNS_RE = re.compile(r'DNS:\s*([^,\s]+)')
+_SAN_IP_RE = re.compile(r'IP(?: Address)?:\s*([^,\s]+)')
+
+# Month abbreviations used in openssl dates
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+}
+
+# One 'KEY = value' component of a DN. openssl 3 double-quotes values that
+# contain a comma (O = "Acme, Inc."), escaping '"' and '\' inside the quotes;
+# unquoted values may backslash-escape commas (RFC 2253 style)
+_DN_RE = re.compile(r'([A-Za-z][A-Za-z0-9.]*)\s*=\s*(?:"((?:[^"\\]|\\.)*)"|((?:[^,\\]|\\.)*))')
+_DN_ESCAPE_RE = re.compile(r'\\(.)')
+
+# Certificates expiring within this many days are reported as expiring soon
+EXPIRY_WARNING_DAYS = 30
+
+# Timeout for Kubernetes API requests, in seconds
+K8S_REQUEST_TIMEOUT = 10
+
+# resourceVersion for pod listings; '0' is served from the apiserver watch cache
+# instead of a quorum read from etcd (static pod specs rarely change)
+STATIC_POD_RESOURCE_VERSION = '0'
+
+# Size of the urllib3 connection pool behind the Kubernetes API client
+K8S_POOL_MAXSIZE = 16
+
+# Maximum number of certificates scanned concurrently
+SCAN_MAX_WORKERS = 16
+
+# Kubernetes certificate directories
+K8S_CERT_DIRS = (
+    '/etc/kubernetes/pki',
+    '/var/lib/minikube/certs',
+    '/etc/kubernetes',
+)
+
+# System certificate directories to exclude
+SYSTEM_CERT_DIRS = (
+    '/etc/ssl/certs',
+    '/usr/share/ca-certificates',
+    '/etc/ca-certificates',
+    '/usr/local/share/ca-certificates',
+)
+
+# Kubernetes API clients shared by every scanner in the process
+_k8s_clients = None
+
+
+def _get_k8s_clients() -> Tuple[Any, Any]:
+    """
+    Get the process-wide Kubernetes ApiClient and CoreV1Api, creating them on first use.
+    
+    Sharing one client lets repeated scanners reuse its keep-alive connections.
+    
+    Returns:
+        Tuple of (ApiClient, CoreV1Api)
+    """
+    global _k8s_clients
+    
+    if _k8s_clients is None:
+        # Try in-cluster config first (when running in a pod)
+        try:
+            config.load_incluster_config()
+            logger.info("✅ Loaded in-cluster Kubernetes configuration")
+        except Exception:
+            # Fall back to kubeconfig (for local testing)
+            try:
+                config.load_kube_config()
+                logger.info("✅ Loaded kubeconfig from default location")
+            except Exception as e:
+                logger.warning("⚠️ Could not load Kubernetes config: %s", e)
+        
+        configuration = client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = K8S_POOL_MAXSIZE
+        api_client = client.ApiClient(configuration=configuration)
+        _k8s_clients = (api_client, client.CoreV1Api(api_client))
+    
+    return _k8s_clients
+
+
+@lru_cache(maxsize=256)
+def _is_k8s_cert_dir(dir_str: str) -> bool:
+    """
+    Check if a directory path names a Kubernetes certificate directory.
+    
+    Args:
+        dir_str: Directory path as a string
+        
+    Returns:
+        True if this is a Kubernetes cert directory, False otherwise
+    """
+    # Check if it's a system cert directory (exclude)
+    if dir_str.startswith(SYSTEM_CERT_DIRS):
+        return False
+    
+    # Check if it's a Kubernetes cert directory (include)
+    if dir_str.startswith(K8S_CERT_DIRS):
+        return True
+    
+    lowered = dir_str.lower()
+    
+    # If it contains 'pki' or 'kubernetes' in the path, it's likely a K8s cert dir
+    if 'pki' in lowered or 'kubernetes' in lowered:
+        return True
+    
+    # If it contains 'minikube' and 'cert', it's likely a K8s cert dir
+    return 'minikube' in lowered and 'cert' in lowered
+
+
+@lru_cache(maxsize=256)
+def _gen_cert_name(arg_key: str, arg_value: str, component: str) -> str:
+    """
+    Generate a friendly certificate name from argument key and value.
+    
+    Args:
+        arg_key: Argument key (e.g., '--tls-cert-file')
+        arg_value: Argument value (path)
+        component: Component name
+        
+    Returns:
+        Friendly certificate name
+    """
+    # Extract filename
+    path = Path(arg_value)
+    base_name = path.stem.removesuffix('.crt').removesuffix('.pem').removesuffix('.key')
+    
+    # Map common patterns to friendly names
+    name_map = {
+        '--tls-cert-file': f'{component}-server',
+        '--client-ca-file': 'ca',
+        '--etcd-cafile': 'etcd-ca',
+        '--etcd-certfile': f'{component}-etcd-client',
+        '--kubelet-client-certificate': f'{component}-kubelet-client',
+        '--proxy-client-cert-file': f'{component}-front-proxy-client',
+    }
+    
+    if arg_key in name_map:
+        return name_map[arg_key]
+    
+    # Use component and base name
+    if base_name:
+        return f'{component}-{base_name}'
+    
+    return f'{component}-cert'
+
 
 class CertificateScanner:
     """Scans Kubernetes cluster for certificates by discovering them from static pods."""
@@ -37,8 +213,19 @@ class CertificateScanner:
         'kube-scheduler': ['kube-scheduler'],
     }
     
+    # Static pod name prefix -> component, and all prefixes for a single startswith() check
+    STATIC_POD_COMPONENTS = {
+        pattern: component
+        for component, patterns in STATIC_POD_PATTERNS.items()
+        for pattern in patterns
+    }
+    STATIC_POD_PREFIXES = tuple(STATIC_POD_COMPONENTS)
+    
+    # Server-side filter for the static pods above
+    STATIC_POD_LABEL_SELECTOR = f"component in ({','.join(STATIC_POD_PATTERNS)})"
+    
     # Certificate argument patterns to extract from pod args
-    CERT_ARG_PATTERNS = [
+    CERT_ARG_PATTERNS = frozenset({
         '--tls-cert-file',
         '--tls-private-key-file',
         '--client-ca-file',
@@ -50,7 +237,29 @@ class CertificateScanner:
         '--service-account-key-file',
         '--proxy-client-cert-file',
         '--proxy-client-key-file',
-    ]
+    })
+    
+    # Standard kubeadm certificate paths, used when discovery finds nothing
+    KUBEADM_CERT_PATHS = {
+        'apiserver': '/etc/kubernetes/pki/apiserver.crt',
+        'apiserver-kubelet-client': '/etc/kubernetes/pki/apiserver-kubelet-client.crt',
+        'apiserver-etcd-client': '/etc/kubernetes/pki/apiserver-etcd-client.crt',
+        'ca': '/etc/kubernetes/pki/ca.crt',
+        'front-proxy-ca': '/etc/kubernetes/pki/front-proxy-ca.crt',
+        'front-proxy-client': '/etc/kubernetes/pki/front-proxy-client.crt',
+        'etcd-ca': '/etc/kubernetes/pki/etcd/ca.crt',
+        'etcd-server': '/etc/kubernetes/pki/etcd/server.crt',
+        'etcd-peer': '/etc/kubernetes/pki/etcd/peer.crt',
+        'etcd-healthcheck-client': '/etc/kubernetes/pki/etcd/healthcheck-client.crt',
+    }
+    
+    # DNS names the API server certificate must carry in its SAN
+    REQUIRED_APISERVER_DNS_NAMES = frozenset({
+        'kubernetes',
+        'kubernetes.default',
+        'kubernetes.default.svc',
+        'kubernetes.default.svc.cluster.local',
+    })
     
     def __init__(self, cert_base_path: str = '/etc/kubernetes/pki'):
         """
@@ -61,28 +270,21 @@ class CertificateScanner:
         """
         self.cert_base_path = Path(cert_base_path)
         self.scan_results = {}
+        self._now = None
+        self._expiry_threshold = None
+        self._resolved_paths = {}
+        self._parsed_cache = {}
+        self._stat_cache = {}
+        self._path_index = None
         self.k8s_client = None
         self.core_v1 = None
         
         # Initialize Kubernetes client if available
         if KUBERNETES_AVAILABLE:
             try:
-                # Try in-cluster config first (when running in a pod)
-                try:
-                    config.load_incluster_config()
-                    logger.info("✅ Loaded in-cluster Kubernetes configuration")
-                except:
-                    # Fall back to kubeconfig (for local testing)
-                    try:
-                        config.load_kube_config()
-                        logger.info("✅ Loaded kubeconfig from default location")
-                    except Exception as e:
-                        logger.warning(f"⚠️ Could not load Kubernetes config: {e}")
-                
-                self.k8s_client = client.ApiClient()
-                self.core_v1 = client.CoreV1Api()
+                self.k8s_client, self.core_v1 = _get_k8s_clients()
             except Exception as e:
-                logger.warning(f"⚠️ Could not initialize Kubernetes client: {e}")
+                logger.warning("⚠️ Could not initialize Kubernetes client: %s", e)
     
     def scan_cluster_certificates(self) -> Dict[str, Any]:
         """
@@ -93,8 +295,14 @@ class CertificateScanner:
         """
         logger.info("🔍 Starting Kubernetes certificate scan...")
         
+        # Evaluate every certificate against the same reference time
+        self._set_reference_time()
+        
+        # List the known certificate directories once for path resolution
+        self._path_index = self._build_path_index()
+        
         results = {
-            'scan_timestamp': datetime.utcnow().isoformat(),
+            'scan_timestamp': self._now.isoformat(),
             'cluster_type': 'unknown',
             'certificates': [],
             'summary': {
@@ -114,41 +322,42 @@ class CertificateScanner:
                 discovered_certs = self._discover_certificates_from_static_pods()
                 if discovered_certs:
                     results['cluster_type'] = 'kubeadm'
-                    logger.info(f"✅ Discovered {len(discovered_certs)} certificate(s) from static pods")
+                    logger.info("✅ Discovered %d certificate(s) from static pods", len(discovered_certs))
             except Exception as e:
-                logger.warning(f"⚠️ Could not discover certificates from static pods: {e}")
+                logger.warning("⚠️ Could not discover certificates from static pods: %s", e)
         
-        # Also try filesystem-based discovery (fallback)
-        filesystem_certs = self._discover_certificates_from_filesystem()
-        
-        # Merge discovered certificates (static pods take precedence)
-        all_cert_paths = {**filesystem_certs, **discovered_certs}
+        # Static pod discovery already covers the mounted cert directories;
+        # only walk the filesystem when it found nothing
+        if discovered_certs:
+            all_cert_paths = discovered_certs
+        else:
+            all_cert_paths = self._discover_certificates_from_filesystem()
         
         if not all_cert_paths:
             logger.warning("⚠️ No certificates discovered. Trying fallback paths...")
             # Fallback to standard kubeadm paths
             all_cert_paths = self._get_fallback_cert_paths()
         
-        # Scan each discovered certificate
-        for cert_name, cert_path in all_cert_paths.items():
-            cert_info = self._scan_certificate(cert_name, cert_path)
-            
-            if cert_info:
-                results['certificates'].append(cert_info)
-                results['summary']['total_certificates'] += 1
-                
-                # Update summary
-                if cert_info.get('status') == 'expired':
-                    results['summary']['expired'] += 1
-                elif cert_info.get('status') == 'expiring_soon':
-                    results['summary']['expiring_soon'] += 1
-                elif cert_info.get('status') == 'valid':
-                    results['summary']['valid'] += 1
-            else:
-                results['summary']['missing'] += 1
+        # Scan discovered certificates concurrently; map() keeps discovery order
+        cert_infos = []
+        if all_cert_paths:
+            with ThreadPoolExecutor(max_workers=min(SCAN_MAX_WORKERS, len(all_cert_paths))) as executor:
+                cert_infos = list(executor.map(self._scan_certificate,
+                                               all_cert_paths.keys(), all_cert_paths.values()))
+        
+        # Update summary; unreadable certificates come back as None
+        certificates = [cert_info for cert_info in cert_infos if cert_info]
+        results['certificates'] = certificates
+        status_counts = Counter(cert_info.get('status', 'unknown') for cert_info in certificates)
+        
+        summary = results['summary']
+        summary['total_certificates'] = len(certificates)
+        for key in ('expired', 'expiring_soon', 'valid'):
+            summary[key] = status_counts[key]
+        summary['missing'] = len(cert_infos) - len(certificates)
         
         self.scan_results = results
-        logger.info(f"✅ Certificate scan complete: {results['summary']['total_certificates']} certificates found")
+        logger.info("✅ Certificate scan complete: %d certificates found", results['summary']['total_certificates'])
         
         return results
     
@@ -165,29 +374,45 @@ class CertificateScanner:
             return discovered
         
         try:
-            # List all pods in kube-system namespace
-            pods = self.core_v1.list_namespaced_pod(namespace='kube-system')
+            # Ask only for control plane pods (kubeadm labels them with 'component');
+            # clusters that don't use that label get the full kube-system listing.
+            # resourceVersion '0' lets the apiserver answer from its watch cache
+            pods = self.core_v1.list_namespaced_pod(
+                namespace='kube-system',
+                label_selector=self.STATIC_POD_LABEL_SELECTOR,
+                resource_version=STATIC_POD_RESOURCE_VERSION,
+                _request_timeout=K8S_REQUEST_TIMEOUT
+            )
+            if not pods.items:
+                pods = self.core_v1.list_namespaced_pod(
+                    namespace='kube-system',
+                    resource_version=STATIC_POD_RESOURCE_VERSION,
+                    _request_timeout=K8S_REQUEST_TIMEOUT
+                )
             
             for pod in pods.items:
                 pod_name = pod.metadata.name
                 
-                # Check if this is a static pod
-                for component, patterns in self.STATIC_POD_PATTERNS.items():
-                    if any(pattern in pod_name for pattern in patterns):
-                        logger.info(f"📋 Found static pod: {component} ({pod_name})")
-                        
-                        # Extract certificate paths from this pod
-                        certs = self._extract_cert_paths_from_pod(pod, component)
-                        discovered.update(certs)
-                        break
+                # Check if this is a static pod ('<component>-<node name>'); one
+                # startswith() call rejects everything else
+                if not pod_name.startswith(self.STATIC_POD_PREFIXES):
+                    continue
+                
+                component = next(component for prefix, component in self.STATIC_POD_COMPONENTS.items()
+                                 if pod_name.startswith(prefix))
+                logger.info("📋 Found static pod: %s (%s)", component, pod_name)
+                
+                # Extract certificate paths from this pod
+                certs = self._extract_cert_paths_from_pod(pod, component)
+                discovered.update(certs)
             
             return discovered
             
         except ApiException as e:
-            logger.warning(f"⚠️ Kubernetes API error: {e}")
+            logger.warning("⚠️ Kubernetes API error: %s", e)
             return {}
         except Exception as e:
-            logger.warning(f"⚠️ Error discovering certificates from static pods: {e}")
+            logger.warning("⚠️ Error discovering certificates from static pods: %s", e)
             return {}
     
     def _extract_cert_paths_from_pod(self, pod, component: str) -> Dict[str, Path]:
@@ -226,19 +451,19 @@ class CertificateScanner:
             # Extract certificate paths from container arguments
             if container.args:
                 for arg in container.args:
-                    if '=' in arg:
-                        key, value = arg.split('=', 1)
+                    # Only certificate-related '--flag=value' arguments are of interest
+                    if not arg.startswith('--'):
+                        continue
+                    key, sep, value = arg.partition('=')
+                    if sep and key in self.CERT_ARG_PATTERNS:
+                        # Resolve the path
+                        cert_path = self._resolve_cert_path(value, mount_map, component)
                         
-                        # Check if this is a certificate-related argument
-                        if any(pattern in key for pattern in self.CERT_ARG_PATTERNS):
-                            # Resolve the path
-                            cert_path = self._resolve_cert_path(value, mount_map, component)
-                            
-                            if cert_path and cert_path.exists():
-                                # Generate a friendly name
-                                cert_name = self._generate_cert_name(key, value, component)
-                                cert_paths[cert_name] = cert_path
-                                logger.info(f"  ✅ Found certificate: {cert_name} at {cert_path}")
+                        if cert_path and cert_path.exists():
+                            # Generate a friendly name
+                            cert_name = self._generate_cert_name(key, value, component)
+                            cert_paths[cert_name] = cert_path
+                            logger.info("  ✅ Found certificate: %s at %s", cert_name, cert_path)
             
             # Also check for certificates in mounted directories (only Kubernetes cert dirs)
             if container.volume_mounts:
@@ -255,7 +480,10 @@ class CertificateScanner:
     def _resolve_cert_path(self, path_str: str, mount_map: Dict[str, str], component: str) -> Optional[Path]:
         """
         Resolve a certificate path, handling volume mounts and relative paths.
-        Tries multiple locations including common minikube paths.
+        
+        Successful resolutions are remembered for the lifetime of the scanner.
+        A remembered path that no longer exists (e.g. after a mount change) is
+        resolved again; unresolved paths are retried on every call.
         
         Args:
             path_str: Path string from pod argument
@@ -265,55 +493,74 @@ class CertificateScanner:
         Returns:
             Resolved Path object or None
         """
-        path = Path(path_str)
+        key = (path_str, tuple(mount_map.items()))
+        resolved = self._resolved_paths.get(key)
+        if resolved is None or not resolved.exists():
+            resolved = self._find_cert_path(path_str, mount_map)
+            if resolved is not None:
+                self._resolved_paths[key] = resolved
+            else:
+                self._resolved_paths.pop(key, None)
+        return resolved
+    
+    def _cert_search_bases(self) -> List[Path]:
+        """
+        Get the Kubernetes certificate directories searched by file name.
         
-        # List of potential base paths to try (only Kubernetes cert directories)
-        potential_bases = [
+        Returns:
+            List of base directories in priority order
+        """
+        return [
             self.cert_base_path,  # Standard kubeadm path
             Path('/var/lib/minikube/certs'),  # Minikube path
             Path('/etc/kubernetes/pki'),  # Standard kubeadm
         ]
+    
+    def _build_path_index(self) -> Dict[str, Path]:
+        """
+        Index the files in the known certificate directories by file name.
+        
+        Each base directory and its etcd subdirectory is listed once; when
+        the same name appears in several places the highest-priority
+        location wins.
+        
+        Returns:
+            Dictionary mapping file names to paths
+        """
+        index = {}
+        for base in self._cert_search_bases():
+            for directory in (base, base / 'etcd'):
+                for name in self._list_files(str(directory)):
+                    index.setdefault(name, directory / name)
+        return index
+    
+    def _find_cert_path(self, path_str: str, mount_map: Dict[str, str]) -> Optional[Path]:
+        """
+        Locate a certificate file on disk.
+        Tries the path itself, volume mounts, then the indexed Kubernetes
+        certificate directories (including common minikube paths).
+        
+        Args:
+            path_str: Path string from pod argument
+            mount_map: Mapping of volume names to mount paths
+            
+        Returns:
+            Resolved Path object or None
+        """
+        path = Path(path_str)
+        
+        if self._path_index is None:
+            self._path_index = self._build_path_index()
         
-        # If absolute path, try it directly and with different bases
         if path.is_absolute():
             # Try the path as-is first, but only if it's a Kubernetes cert directory
             if path.exists() and self._is_kubernetes_cert_directory(path.parent):
                 return path
             
-            # Try to find it relative to different base paths
-            # Extract the relative part (e.g., /var/lib/minikube/certs/apiserver.crt -> apiserver.crt)
-            file_name = path.name
-            for base in potential_bases:
-                try:
-                    # Try the full path if it's under this base
-                    try:
-                        # Python 3.9+ has is_relative_to
-                        if hasattr(path, 'is_relative_to') and path.is_relative_to(base):
-                            if path.exists():
-                                return path
-                    except AttributeError:
-                        # Fall back to checking if path starts with base
-                        try:
-                            path_str = str(path)
-                            base_str = str(base)
-                            if path_str.startswith(base_str):
-                                if path.exists():
-                                    return path
-                        except:
-                            pass
-                    
-                    # Try to find the file by name in the base directory
-                    potential_path = base / file_name
-                    if potential_path.exists():
-                        return potential_path
-                    # Also try in subdirectories
-                    for subdir in ['etcd', '']:
-                        potential_path = base / subdir / file_name if subdir else base / file_name
-                        if potential_path.exists():
-                            return potential_path
-                except (ValueError, AttributeError, OSError):
-                    # Path operations failed, continue
-                    pass
+            # Otherwise look the file up by name in the known cert directories
+            indexed = self._path_index.get(path.name)
+            if indexed is not None:
+                return indexed
         
         # Check if path references a volume mount
         for vol_name, mount_path in mount_map.items():
@@ -322,24 +569,12 @@ class CertificateScanner:
                 if resolved.exists():
                     return resolved
         
-        # Try relative to cert_base_path
+        # Try relative to cert_base_path, then by file name
         if not path.is_absolute():
             resolved = self.cert_base_path / path
             if resolved.exists():
                 return resolved
-        
-        # Last resort: try to find by filename in common locations (only K8s cert dirs)
-        file_name = path.name
-        for base in potential_bases:
-            if base.exists() and self._is_kubernetes_cert_directory(base):
-                # Try direct
-                potential = base / file_name
-                if potential.exists():
-                    return potential
-                # Try in etcd subdirectory
-                potential = base / 'etcd' / file_name
-                if potential.exists():
-                    return potential
+            return self._path_index.get(path.name)
         
         return None
     
@@ -355,28 +590,7 @@ class CertificateScanner:
         Returns:
             Friendly certificate name
         """
-        # Extract filename
-        path = Path(arg_value)
-        base_name = path.stem.replace('.crt', '').replace('.pem', '').replace('.key', '')
-        
-        # Map common patterns to friendly names
-        name_map = {
-            '--tls-cert-file': f'{component}-server',
-            '--client-ca-file': 'ca',
-            '--etcd-cafile': 'etcd-ca',
-            '--etcd-certfile': f'{component}-etcd-client',
-            '--kubelet-client-certificate': f'{component}-kubelet-client',
-            '--proxy-client-cert-file': f'{component}-front-proxy-client',
-        }
-        
-        if arg_key in name_map:
-            return name_map[arg_key]
-        
-        # Use component and base name
-        if base_name:
-            return f'{component}-{base_name}'
-        
-        return f'{component}-cert'
+        return _gen_cert_name(arg_key, arg_value, component)
     
     def _is_kubernetes_cert_directory(self, directory: Path) -> bool:
         """
@@ -388,42 +602,7 @@ class CertificateScanner:
         Returns:
             True if this is a Kubernetes cert directory, False otherwise
         """
-        dir_str = str(directory)
-        
-        # Kubernetes certificate directories
-        k8s_cert_dirs = [
-            '/etc/kubernetes/pki',
-            '/var/lib/minikube/certs',
-            '/etc/kubernetes',
-        ]
-        
-        # System certificate directories to exclude
-        system_cert_dirs = [
-            '/etc/ssl/certs',
-            '/usr/share/ca-certificates',
-            '/etc/ca-certificates',
-            '/usr/local/share/ca-certificates',
-        ]
-        
-        # Check if it's a system cert directory (exclude)
-        for sys_dir in system_cert_dirs:
-            if dir_str.startswith(sys_dir):
-                return False
-        
-        # Check if it's a Kubernetes cert directory (include)
-        for k8s_dir in k8s_cert_dirs:
-            if dir_str.startswith(k8s_dir):
-                return True
-        
-        # If it contains 'pki' or 'kubernetes' in the path, it's likely a K8s cert dir
-        if 'pki' in dir_str.lower() or 'kubernetes' in dir_str.lower():
-            return True
-        
-        # If it contains 'minikube' and 'cert', it's likely a K8s cert dir
-        if 'minikube' in dir_str.lower() and 'cert' in dir_str.lower():
-            return True
-        
-        return False
+        return _is_k8s_cert_dir(str(directory))
     
     def _find_certificates_in_directory(self, directory: Path) -> Dict[str, Path]:
         """
@@ -442,31 +621,28 @@ class CertificateScanner:
         
         # Only scan Kubernetes certificate directories
         if not self._is_kubernetes_cert_directory(directory):
-            logger.debug(f"Skipping non-Kubernetes certificate directory: {directory}")
+            logger.debug("Skipping non-Kubernetes certificate directory: %s", directory)
             return certs
         
         try:
-            # Look for .crt and .pem files (non-recursive to avoid system certs)
-            for ext in ['*.crt', '*.pem']:
-                # First check direct files in the directory
-                for cert_file in directory.glob(ext):
-                    if cert_file.is_file():
-                        cert_name = cert_file.stem
+            # Look for .crt and .pem files (non-recursive to avoid system certs),
+            # then in the etcd subdirectory if it exists
+            for search_dir, prefix in ((directory, ''), (directory / 'etcd', 'etcd-')):
+                try:
+                    entries = os.scandir(search_dir)
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+                with entries:
+                    for entry in entries:
+                        name = entry.name
+                        if not name.endswith(('.crt', '.pem')) or not entry.is_file():
+                            continue
+                        cert_name = name[:-4]
                         # Skip key files
                         if 'key' not in cert_name.lower():
-                            certs[cert_name] = cert_file
-                
-                # Also check in etcd subdirectory if it exists
-                etcd_dir = directory / 'etcd'
-                if etcd_dir.exists() and etcd_dir.is_dir():
-                    for cert_file in etcd_dir.glob(ext):
-                        if cert_file.is_file():
-                            cert_name = cert_file.stem
-                            # Skip key files
-                            if 'key' not in cert_name.lower():
-                                certs[f'etcd-{cert_name}'] = cert_file
+                            certs[f'{prefix}{cert_name}'] = Path(entry.path)
         except Exception as e:
-            logger.warning(f"⚠️ Error searching directory {directory}: {e}")
+            logger.warning("⚠️ Error searching directory %s: %s", directory, e)
         
         return certs
     
@@ -489,7 +665,7 @@ class CertificateScanner:
         
         for cert_dir in k8s_cert_dirs:
             if cert_dir.exists() and self._is_kubernetes_cert_directory(cert_dir):
-                logger.info(f"🔍 Searching Kubernetes certificate directory: {cert_dir}")
+                logger.info("🔍 Searching Kubernetes certificate directory: %s", cert_dir)
                 dir_certs = self._find_certificates_in_directory(cert_dir)
                 discovered.update(dir_certs)
         
@@ -504,27 +680,34 @@ class CertificateScanner:
         """
         fallback = {}
         
-        # Standard kubeadm certificate paths
-        standard_paths = {
-            'apiserver': '/etc/kubernetes/pki/apiserver.crt',
-            'apiserver-kubelet-client': '/etc/kubernetes/pki/apiserver-kubelet-client.crt',
-            'apiserver-etcd-client': '/etc/kubernetes/pki/apiserver-etcd-client.crt',
-            'ca': '/etc/kubernetes/pki/ca.crt',
-            'front-proxy-ca': '/etc/kubernetes/pki/front-proxy-ca.crt',
-            'front-proxy-client': '/etc/kubernetes/pki/front-proxy-client.crt',
-            'etcd-ca': '/etc/kubernetes/pki/etcd/ca.crt',
-            'etcd-server': '/etc/kubernetes/pki/etcd/server.crt',
-            'etcd-peer': '/etc/kubernetes/pki/etcd/peer.crt',
-            'etcd-healthcheck-client': '/etc/kubernetes/pki/etcd/healthcheck-client.crt',
-        }
-        
-        for name, path_str in standard_paths.items():
-            path = Path(path_str)
-            if path.exists():
-                fallback[name] = path
+        # List each directory once and test names against the listing instead of
+        # stat'ing every candidate; only build Path objects for files that exist
+        listings = {}
+        for name, path_str in self.KUBEADM_CERT_PATHS.items():
+            directory, file_name = os.path.split(path_str)
+            if directory not in listings:
+                listings[directory] = self._list_files(directory)
+            if file_name in listings[directory]:
+                fallback[name] = Path(path_str)
         
         return fallback
     
+    def _list_files(self, directory: str) -> set:
+        """
+        List the names of regular files in a directory.
+        
+        Args:
+            directory: Directory path
+            
+        Returns:
+            Set of file names (empty if the directory cannot be read)
+        """
+        try:
+            with os.scandir(directory) as entries:
+                return {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            return set()
+    
     def _scan_certificate(self, cert_name: str, cert_path: Path) -> Optional[Dict[str, Any]]:
         """
         Scan a single certificate file.
@@ -536,49 +719,89 @@ class CertificateScanner:
         Returns:
             Certificate information dictionary or None
         """
-        if not cert_path or not cert_path.exists():
-            logger.warning(f"Certificate not found: {cert_name} at {cert_path}")
+        if not cert_path:
+            logger.warning("Certificate not found: %s at %s", cert_name, cert_path)
             return None
         
+        # Discovery has already checked that the path exists, so just open it.
+        # A file unchanged since an earlier scan (same path, mtime and size) is
+        # not read again; otherwise the bytes are read once and shared by the
+        # digest and the parser.
         try:
-            # Use openssl to extract certificate information
-            result = subprocess.run(
-                ['openssl', 'x509', '-in', str(cert_path), '-text', '-noout'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            cert_text = result.stdout
-            cert_info = self._parse_openssl_output(cert_name, cert_path, cert_text)
-            
-            logger.debug(f"Scanned certificate: {cert_name}")
-            return cert_info
-            
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error scanning certificate {cert_name}: {e.stderr}")
+            with open(cert_path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                stat_key = (str(cert_path), st.st_mtime_ns, st.st_size)
+                parsed = self._stat_cache.get(stat_key)
+                if parsed is None:
+                    data = f.read()
+        except FileNotFoundError:
+            logger.warning("Certificate not found: %s at %s", cert_name, cert_path)
             return None
-        except Exception as e:
-            logger.error(f"Unexpected error scanning certificate {cert_name}: {e}")
+        except OSError as e:
+            logger.error("Error reading certificate %s: %s", cert_name, e)
             return None
+        
+        if parsed is None:
+            # Files with identical content (shared CAs, symlinks) are only parsed once
+            digest = hashlib.sha256(data).digest()
+            parsed = self._parsed_cache.get(digest)
+            if parsed is None:
+                try:
+                    parsed = self._parse_certificate_data(data)
+                except subprocess.CalledProcessError as e:
+                    logger.error("Error scanning certificate %s: %s", cert_name, e.stderr.decode(errors='replace'))
+                    return None
+                except Exception as e:
+                    logger.error("Error scanning certificate %s: %s", cert_name, e)
+                    return None
+                self._parsed_cache[digest] = parsed
+            self._stat_cache[stat_key] = parsed
+        
+        # Status and validation depend on the certificate name, so always recompute them
+        cert_info = self._evaluate_certificate(self._new_cert_info(cert_name, cert_path, parsed))
+        
+        logger.debug("Scanned certificate: %s", cert_name)
+        return cert_info
+    
+    def _parse_certificate_data(self, data: bytes) -> Dict[str, Any]:
+        """
+        Extract the name-independent fields from PEM or DER certificate bytes.
+        
+        Uses the cryptography library when available and falls back to openssl.
+        
+        Args:
+            data: Raw certificate file contents
+            
+        Returns:
+            Dictionary with subject, issuer, validity, san and key_info
+        """
+        if CRYPTOGRAPHY_AVAILABLE:
+            if b'-----BEGIN' in data:
+                cert = x509.load_pem_x509_certificate(data)
+            else:
+                cert = x509.load_der_x509_certificate(data)
+            return self._parse_x509_certificate(cert)
+        
+        # Skip the sections the parser never reads (serial, signature dump, ...)
+        result = subprocess.run(
+            ['openssl', 'x509', '-noout', '-text', '-certopt', OPENSSL_CERTOPT],
+            input=data,
+            capture_output=True,
+            check=True
+        )
+        return self._parse_openssl_output(result.stdout.decode(errors='replace'))
     
-    def _parse_openssl_output(self, cert_name: str, cert_path: Path, openssl_output: str) -> Dict[str, Any]:
+    def _parse_openssl_output(self, openssl_output: str) -> Dict[str, Any]:
         """
         Parse openssl x509 output into structured data.
         
         Args:
-            cert_name: Name of the certificate
-            cert_path: Path to certificate file
             openssl_output: Output from openssl x509 command
             
         Returns:
-            Structured certificate information
+            Dictionary with subject, issuer, validity, san and key_info
         """
-        lines = openssl_output.split('\n')
-        
         cert_info = {
-            'name': cert_name,
-            'path': str(cert_path),
             'subject': {},
             'issuer': {},
             'validity': {},
@@ -586,65 +809,177 @@ class CertificateScanner:
                 'dns_names': [],
                 'ip_addresses': []
             },
-            'key_info': {},
-            'status': 'unknown',
-            'days_until_expiry': None,
-            'issues': []
+            'key_info': {}
         }
         
-        current_section = None
-        for line in lines:
-            line = line.strip()
+        # One pass over the output picks up every single-line field
+        for match in _OPENSSL_FIELD_RE.finditer(openssl_output):
+            field, value = match.group(1), match.group(2).strip()
             
-            # Subject
-            if line.startswith('Subject:'):
-                cert_info['subject'] = self._parse_dn(line.replace('Subject:', '').strip())
-            
-            # Issuer
-            elif line.startswith('Issuer:'):
-                cert_info['issuer'] = self._parse_dn(line.replace('Issuer:', '').strip())
+            if field == 'Subject':
+                cert_info['subject'] = self._parse_dn(value)
+            elif field == 'Issuer':
+                cert_info['issuer'] = self._parse_dn(value)
+            elif field == 'Not Before':
+                cert_info['validity']['not_before'] = self._parse_date(value)
+            elif field == 'Not After':
+                cert_info['validity']['not_after'] = self._parse_date(value)
+            elif field == 'Public Key Algorithm':
+                cert_info['key_info']['algorithm'] = value
+            else:
+                # 'Public-Key: (2048 bit)' -> '2048 bit'
+                cert_info['key_info']['size'] = value.strip('()')
+        
+        # The SAN extension body is the line following its header
+        san_match = _OPENSSL_SAN_RE.search(openssl_output)
+        if san_match:
+            san_line = san_match.group(1)
+            cert_info['san']['dns_names'].extend(_SAN_DNS_RE.findall(san_line))
+            cert_info['san']['ip_addresses'].extend(_SAN_IP_RE.findall(san_line))
+        
+        return cert_info
+    
+    def _parse_x509_certificate(self, cert: 'x509.Certificate') -> Dict[str, Any]:
+        """
+        Extract the name-independent fields of a loaded x509 certificate.
+        
+        Args:
+            cert: Certificate loaded by the cryptography library
             
-            # Validity
-            elif line.startswith('Not Before:'):
-                cert_info['validity']['not_before'] = self._parse_date(line.replace('Not Before:', '').strip())
-            elif line.startswith('Not After :') or line.startswith('Not After:'):
-                cert_info['validity']['not_after'] = self._parse_date(line.replace('Not After :', '').replace('Not After:', '').strip())
+        Returns:
+            Dictionary with subject, issuer, validity, san and key_info
+        """
+        # cryptography >= 42 exposes timezone-aware properties; keep naive UTC like the openssl path
+        not_before = getattr(cert, 'not_valid_before_utc', None)
+        not_after = getattr(cert, 'not_valid_after_utc', None)
+        not_before = not_before.replace(tzinfo=None) if not_before else cert.not_valid_before
+        not_after = not_after.replace(tzinfo=None) if not_after else cert.not_valid_after
+        
+        try:
+            san_ext = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+            san = {
+                'dns_names': san_ext.get_values_for_type(x509.DNSName),
+                'ip_addresses': [str(ip) for ip in san_ext.get_values_for_type(x509.IPAddress)]
+            }
+        except x509.ExtensionNotFound:
+            san = {'dns_names': [], 'ip_addresses': []}
+        
+        return {
+            'subject': self._name_to_dict(cert.subject),
+            'issuer': self._name_to_dict(cert.issuer),
+            'validity': {
+                'not_before': not_before,
+                'not_after': not_after
+            },
+            'san': san,
+            'key_info': self._public_key_info(cert)
+        }
+    
+    def _new_cert_info(self, cert_name: str, cert_path: Path, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build an unevaluated certificate information dictionary from parsed fields.
+        
+        Nested containers are copied so that results never share state with
+        the parse cache or with each other.
+        
+        Args:
+            cert_name: Name of the certificate
+            cert_path: Path to certificate file
+            parsed: Fields returned by _parse_certificate_data
             
-            # Subject Alternative Name
-            elif 'X509v3 Subject Alternative Name' in line or current_section == 'san':
-                current_section = 'san'
-                if 'DNS:' in line:
-                    dns_names = [d.replace('DNS:', '').strip() for d in line.split(',') if 'DNS:' in d]
-                    cert_info['san']['dns_names'].extend(dns_names)
-                if 'IP Address:' in line or 'IP:' in line:
-                    ip_addrs = [ip.replace('IP Address:', '').replace('IP:', '').strip() 
-                               for ip in line.split(',') if 'IP Address:' in ip or 'IP:' in ip]
-                    cert_info['san']['ip_addresses'].extend(ip_addrs)
+        Returns:
+            Certificate information dictionary
+        """
+        san = parsed['san']
+        return {
+            'name': cert_name,
+            'path': str(cert_path),
+            'subject': dict(parsed['subject']),
+            'issuer': dict(parsed['issuer']),
+            'validity': dict(parsed['validity']),
+            'san': {
+                'dns_names': list(san['dns_names']),
+                'ip_addresses': list(san['ip_addresses'])
+            },
+            'key_info': dict(parsed['key_info']),
+            'status': 'unknown',
+            'days_until_expiry': None,
+            'issues': []
+        }
+    
+    def _name_to_dict(self, name: 'x509.Name') -> Dict[str, str]:
+        """
+        Convert an x509 Name into the same dictionary shape as _parse_dn.
+        
+        Args:
+            name: Subject or issuer name
             
-            # Key information
-            elif 'Public Key Algorithm:' in line:
-                cert_info['key_info']['algorithm'] = line.replace('Public Key Algorithm:', '').strip()
-            elif 'RSA Public-Key:' in line or 'Public-Key:' in line:
-                key_size = line.replace('RSA Public-Key:', '').replace('Public-Key:', '').strip()
-                cert_info['key_info']['size'] = key_size
+        Returns:
+            Dictionary of DN components
+        """
+        return {attr.rfc4514_attribute_name: attr.value for attr in name}
+    
+    def _public_key_info(self, cert: 'x509.Certificate') -> Dict[str, str]:
+        """
+        Describe the certificate's public key using openssl's naming.
+        
+        Args:
+            cert: Certificate loaded by the cryptography library
             
-            # Reset section if we hit a new major section
-            if line and not line.startswith(' ') and ':' in line and current_section == 'san':
-                if 'X509v3' not in line:
-                    current_section = None
+        Returns:
+            Dictionary with key algorithm and size
+        """
+        try:
+            public_key = cert.public_key()
+        except Exception:
+            return {}
+        
+        if isinstance(public_key, rsa.RSAPublicKey):
+            algorithm = 'rsaEncryption'
+        elif isinstance(public_key, ec.EllipticCurvePublicKey):
+            algorithm = 'id-ecPublicKey'
+        elif isinstance(public_key, dsa.DSAPublicKey):
+            algorithm = 'dsaEncryption'
+        elif isinstance(public_key, ed25519.Ed25519PublicKey):
+            return {'algorithm': 'ED25519', 'size': '256 bit'}
+        elif isinstance(public_key, ed448.Ed448PublicKey):
+            return {'algorithm': 'ED448', 'size': '456 bit'}
+        else:
+            return {}
+        
+        return {'algorithm': algorithm, 'size': f'{public_key.key_size} bit'}
+    
+    def _set_reference_time(self) -> None:
+        """Fix the time that certificate expiry is measured against."""
+        # Naive UTC, matching the parsed certificate dates
+        self._now = datetime.now(timezone.utc).replace(tzinfo=None)
+        self._expiry_threshold = self._now + timedelta(days=EXPIRY_WARNING_DAYS)
+    
+    def _evaluate_certificate(self, cert_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Determine expiry status and validation issues for parsed certificate information.
         
+        Args:
+            cert_info: Structured certificate information (updated in place)
+            
+        Returns:
+            The same certificate information dictionary
+        """
         # Determine status
         if cert_info['validity'].get('not_after'):
             not_after = cert_info['validity']['not_after']
             if isinstance(not_after, datetime):
-                now = datetime.utcnow()
-                days_until = (not_after - now).days
+                # Certificates scanned outside scan_cluster_certificates() get a fresh reference time
+                if self._now is None:
+                    self._set_reference_time()
+                
+                days_until = (not_after - self._now).days
                 cert_info['days_until_expiry'] = days_until
                 
-                if days_until < 0:
+                if not_after < self._now:
                     cert_info['status'] = 'expired'
                     cert_info['issues'].append('Certificate has expired')
-                elif days_until < 30:
+                elif not_after < self._expiry_threshold:
                     cert_info['status'] = 'expiring_soon'
                     cert_info['issues'].append(f'Certificate expires in {days_until} days')
                 else:
@@ -661,18 +996,20 @@ class CertificateScanner:
         Parse Distinguished Name string.
         
         Args:
-            dn_string: DN string like "CN=kubernetes, O=system:masters"
+            dn_string: DN string like "CN=kubernetes, O=system:masters" or
+                'CN = kube, O = "Acme, Inc."'
             
         Returns:
             Dictionary of DN components
         """
         dn = {}
-        parts = dn_string.split(',')
-        for part in parts:
-            part = part.strip()
-            if '=' in part:
-                key, value = part.split('=', 1)
-                dn[key.strip()] = value.strip()
+        for match in _DN_RE.finditer(dn_string):
+            value = match.group(2)
+            if value is None:
+                value = match.group(3).strip()
+            if '\\' in value:
+                value = _DN_ESCAPE_RE.sub(r'\1', value)
+            dn[match.group(1)] = value
         return dn
     
     def _parse_date(self, date_string: str) -> Optional[datetime]:
@@ -687,10 +1024,17 @@ class CertificateScanner:
         """
         try:
             # Remove GMT and parse
-            date_string = date_string.replace('GMT', '').strip()
+            date_string = date_string.strip().removesuffix('GMT').strip()
+            
+            # Fast path for openssl's fixed 'Mon DD HH:MM:SS YYYY' layout (day is space-padded)
+            month = _MONTHS.get(date_string[:3])
+            if month and len(date_string) == 20 and date_string[3] == ' ' and date_string[6] == ' ':
+                return datetime(int(date_string[16:20]), month, int(date_string[4:6]),
+                                int(date_string[7:9]), int(date_string[10:12]), int(date_string[13:15]))
+            
             return datetime.strptime(date_string, '%b %d %H:%M:%S %Y')
         except Exception as e:
-            logger.warning(f"Could not parse date: {date_string}, {e}")
+            logger.warning("Could not parse date: %s, %s", date_string, e)
             return None
     
     def _validate_certificate(self, cert_info: Dict[str, Any]) -> List[str]:
@@ -708,20 +1052,16 @@ class CertificateScanner:
         
         # API Server certificate validation
         if 'apiserver' in cert_name and 'kubelet-client' not in cert_name and 'etcd-client' not in cert_name:
-            # Should have SAN entries for all required names
-            required_dns = ['kubernetes', 'kubernetes.default', 'kubernetes.default.svc', 
-                          'kubernetes.default.svc.cluster.local']
-            dns_names = cert_info.get('san', {}).get('dns_names', [])
-            
-            for required in required_dns:
-                if required not in dns_names:
-                    issues.append(f'Missing required DNS name in SAN: {required}')
+            # Should have SAN entries for all required names (sorted for a stable report order)
+            dns_names = cert_info.get('san', {}).get('dns_names', ())
+            missing = self.REQUIRED_APISERVER_DNS_NAMES.difference(dns_names)
+            issues.extend(f'Missing required DNS name in SAN: {required}' for required in sorted(missing))
         
         # Check key size (should be at least 2048 bits)
         key_size = cert_info.get('key_info', {}).get('size', '')
         if key_size:
             try:
-                size_num = int(key_size.replace('bit', '').strip())
+                size_num = int(key_size.strip().removesuffix('bit'))
                 if size_num < 2048:
                     issues.append(f'Key size ({size_num} bits) is below recommended 2048 bits')
             except:
@@ -744,7 +1084,23 @@ class CertificateScanner:
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_file, 'w') as f:
-            json.dump(self.scan_results, f, indent=2, default=str)
-        
-        logger.info(f"Results saved to {output_file}")
+        # Write next to the target and rename it into place, so readers watching the
+        # directory (the Slack notifier) never see a partially written '*.json' file
+        tmp_file = output_file.with_name(output_file.name + '.tmp')
+        try:
+            if ORJSON_AVAILABLE:
+                # Pass datetimes through to str() so timestamps match the json output format
+                tmp_file.write_bytes(orjson.dumps(
+                    self.scan_results,
+                    default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+                ))
+            else:
+                with open(tmp_file, 'w') as f:
+                    json.dump(self.scan_results, f, indent=2, default=str)
+            os.replace(tmp_file, output_file)
+        except BaseException:
+            tmp_file.unlink(missing_ok=True)
+            raise
+        
+        logger.info("Results saved to %s", output_file)
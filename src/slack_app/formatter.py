@@ -4,11 +4,81 @@ Slack Formatter Module
 Handles formatting of certificate scan results into Slack message blocks.
 """
 
+import heapq
 import json
 import time
-from typing import Dict, Any, List
+from collections import Counter
+from itertools import chain, islice
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Certificate status -> (emoji, overall status text, attachment color)
+_STATUS_STYLE = {
+    'expired': ("🔴", "CRITICAL", "#ff0000"),
+    'expiring_soon': ("⚠️", "WARNING", "#ff9900"),
+    'valid': ("✅", "HEALTHY", "#36a64f"),
+}
+
+# Report header block for each overall status, pre-interpolated
+_HEADER_BLOCKS = {
+    status: {
+        "type": "header",
+        "text": {
+            "type": "plain_text",
+            "text": f"{emoji} Kubernetes Certificate Health Check",
+            "emoji": True
+        }
+    }
+    for status, (emoji, _, _) in _STATUS_STYLE.items()
+}
+
+# Static blocks shared by every message. They are plain dicts because the Slack
+# client JSON-encodes blocks as given; treat them as read-only.
+_DIVIDER = {"type": "divider"}
+
+_TEST_BLOCKS = (
+    {
+        "type": "header",
+        "text": {
+            "type": "plain_text",
+            "text": "🔐 Kubernetes Certificate Health Check Test"
+        }
+    },
+    {
+        "type": "section",
+        "fields": [
+            {
+                "type": "mrkdwn",
+                "text": "*Test Status:*\n✅ Connection Working"
+            },
+            {
+                "type": "mrkdwn",
+                "text": "*Bot Status:*\n🤖 Ready for certificate scanning"
+            }
+        ]
+    },
+    _DIVIDER,
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": "This is a *test message* to verify the Kubernetes certificate health check Slack integration is working correctly! 🎉"
+        }
+    }
+)
+
+
+def _expiry_sort_key(cert: Dict[str, Any]) -> Tuple[bool, int]:
+    """Sort key ordering certificates by days until expiry, unknown expiry last."""
+    days = cert.get('days_until_expiry')
+    return (days is None, days or 0)
+
 
 class SlackFormatter:
     """Formats certificate scan results into Slack message blocks."""
@@ -16,226 +86,177 @@ class SlackFormatter:
     @staticmethod
     def parse_certificate_summary(data: Dict[str, Any]) -> Dict[str, Any]:
         """Parse certificate scan data to extract summary information."""
-        summary = data.get('summary', {})
-        certificates = data.get('certificates', [])
+        get = data.get
+        certificates = get('certificates', [])
+        summary = get('summary')
+        if not summary and certificates:
+            # No scanner summary; count statuses in one pass over the certificates
+            summary = Counter(cert.get('status', 'unknown') for cert in certificates)
+            summary['total_certificates'] = len(certificates)
+        summary_get = (summary or {}).get
         
         return {
-            'total_certificates': summary.get('total_certificates', 0),
-            'expired': summary.get('expired', 0),
-            'expiring_soon': summary.get('expiring_soon', 0),
-            'valid': summary.get('valid', 0),
-            'missing': summary.get('missing', 0),
-            'cluster_type': data.get('cluster_type', 'unknown'),
-            'scan_timestamp': data.get('scan_timestamp', ''),
+            'total_certificates': summary_get('total_certificates', 0),
+            'expired': summary_get('expired', 0),
+            'expiring_soon': summary_get('expiring_soon', 0),
+            'valid': summary_get('valid', 0),
+            'missing': summary_get('missing', 0),
+            'cluster_type': get('cluster_type', 'unknown'),
+            'scan_timestamp': get('scan_timestamp', ''),
             'certificates': certificates
         }
     
     @staticmethod
-    def create_certificate_blocks(summary: Dict[str, Any], analysis: Dict[str, Any] = None) -> List[Dict[str, Any]]:
-        """Create Slack blocks for certificate report."""
+    def create_certificate_blocks(summary: Dict[str, Any], analysis: Dict[str, Any] = None,
+                                  now: Optional[time.struct_time] = None) -> List[Dict[str, Any]]:
+        """Create Slack blocks for certificate report (timestamped with now, default current UTC time)."""
+        analysis = analysis or {}
+        
+        return list(chain(
+            SlackFormatter._header_blocks(summary),
+            SlackFormatter._issue_section("*🔴 Critical Issues:*", analysis.get('critical_issues')),
+            SlackFormatter._issue_section("*⚠️ Warnings:*", analysis.get('warnings')),
+            SlackFormatter._certificate_rows(summary.get('certificates')),
+            SlackFormatter._recommendation_section(analysis.get('recommendations')),
+            SlackFormatter._footer_blocks(now),
+        ))
+    
+    @staticmethod
+    def _section(text: str) -> Dict[str, Any]:
+        """Create a single mrkdwn section block."""
+        return {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": text
+            }
+        }
+    
+    @staticmethod
+    def _bullet(name: str, text: str) -> Dict[str, Any]:
+        """Create a '• *name*: text' section block."""
+        return SlackFormatter._section(f"• *{name}*: {text}")
+    
+    @staticmethod
+    def _header_blocks(summary: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield the report header, status line and summary counts."""
+        total = summary['total_certificates']
+        expired = summary['expired']
+        soon = summary['expiring_soon']
+        valid = summary['valid']
+        cluster = summary.get('cluster_type', 'Unknown')
+        
         # Determine overall status
-        if summary['expired'] > 0:
-            status_emoji = "🔴"
-            status_text = "CRITICAL"
-            status_color = "#ff0000"
-        elif summary['expiring_soon'] > 0:
-            status_emoji = "⚠️"
-            status_text = "WARNING"
-            status_color = "#ff9900"
+        if expired > 0:
+            overall = 'expired'
+        elif soon > 0:
+            overall = 'expiring_soon'
         else:
-            status_emoji = "✅"
-            status_text = "HEALTHY"
-            status_color = "#36a64f"
+            overall = 'valid'
+        _, status_text, _ = _STATUS_STYLE[overall]
         
-        blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"{status_emoji} Kubernetes Certificate Health Check",
-                    "emoji": True
-                }
-            },
-            {
-                "type": "section",
-                "text": {
+        yield _HEADER_BLOCKS[overall]
+        yield SlackFormatter._section(
+            f"*Status:* {status_text}\n*Cluster Type:* {cluster}"
+        )
+        yield {
+            "type": "section",
+            "fields": [
+                {
                     "type": "mrkdwn",
-                    "text": f"*Status:* {status_text}\n*Cluster Type:* {summary.get('cluster_type', 'Unknown')}"
-                }
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Total Certificates:*\n`{summary['total_certificates']}`"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Valid:*\n✅ `{summary['valid']}`"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Expired:*\n🔴 `{summary['expired']}`"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Expiring Soon:*\n⚠️ `{summary['expiring_soon']}`"
-                    }
-                ]
-            }
-        ]
-        
-        # Add critical issues section
-        if analysis and analysis.get('critical_issues'):
-            blocks.append({"type": "divider"})
-            blocks.append({
-                "type": "section",
-                "text": {
+                    "text": f"*Total Certificates:*\n`{total}`"
+                },
+                {
                     "type": "mrkdwn",
-                    "text": "*🔴 Critical Issues:*"
-                }
-            })
-            for issue in analysis['critical_issues'][:5]:  # Show top 5
-                cert_name = issue.get('certificate', 'Unknown')
-                issue_text = issue.get('issue', '')
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"• *{cert_name}*: {issue_text}"
-                    }
-                })
-        
-        # Add warnings section
-        if analysis and analysis.get('warnings'):
-            blocks.append({"type": "divider"})
-            blocks.append({
-                "type": "section",
-                "text": {
+                    "text": f"*Valid:*\n✅ `{valid}`"
+                },
+                {
                     "type": "mrkdwn",
-                    "text": "*⚠️ Warnings:*"
-                }
-            })
-            for warning in analysis['warnings'][:5]:  # Show top 5
-                cert_name = warning.get('certificate', 'Unknown')
-                warning_text = warning.get('issue', '')
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"• *{cert_name}*: {warning_text}"
-                    }
-                })
-        
-        # Add certificate details
-        if summary.get('certificates'):
-            blocks.append({"type": "divider"})
-            blocks.append({
-                "type": "section",
-                "text": {
+                    "text": f"*Expired:*\n🔴 `{expired}`"
+                },
+                {
                     "type": "mrkdwn",
-                    "text": "*📋 Certificate Details:*"
+                    "text": f"*Expiring Soon:*\n⚠️ `{soon}`"
                 }
-            })
-            
-            for cert in summary['certificates'][:10]:  # Show top 10
-                cert_name = cert.get('name', 'Unknown')
-                status = cert.get('status', 'unknown')
-                days = cert.get('days_until_expiry')
-                
-                # Choose emoji based on status
-                if status == 'expired':
-                    emoji = "🔴"
-                elif status == 'expiring_soon':
-                    emoji = "⚠️"
-                else:
-                    emoji = "✅"
-                
-                status_text = f"{emoji} {status.upper()}"
-                if days is not None:
-                    status_text += f" ({days} days)"
-                
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"*{cert_name}*: {status_text}"
-                    }
-                })
+            ]
+        }
+    
+    @staticmethod
+    def _issue_section(title: str, issues: Optional[List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """Yield a titled section listing the top 5 certificate issues, if any."""
+        if not issues:
+            return
         
-        # Add recommendations if available
-        if analysis and analysis.get('recommendations'):
-            blocks.append({"type": "divider"})
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "*💡 Recommendations:*"
-                }
-            })
-            for rec in analysis['recommendations'][:5]:  # Show top 5
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"• {rec}"
-                    }
-                })
+        yield _DIVIDER
+        yield SlackFormatter._section(title)
+        bullet = SlackFormatter._bullet
+        for issue in islice(issues, 5):  # Show top 5
+            yield bullet(issue.get('certificate', 'Unknown'), issue.get('issue', ''))
+    
+    @staticmethod
+    def _certificate_rows(certificates: Optional[List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """Yield the certificate details section for the 10 soonest-expiring certificates, if any."""
+        if not certificates:
+            return
+        
+        yield _DIVIDER
+        yield SlackFormatter._section("*📋 Certificate Details:*")
+        
+        # Show the top 10 by urgency; certificates without an expiry go last
+        most_urgent = heapq.nsmallest(10, certificates, key=_expiry_sort_key)
+        section = SlackFormatter._section
+        for cert in most_urgent:
+            get = cert.get
+            cert_name, status, days = get('name', 'Unknown'), get('status', 'unknown'), get('days_until_expiry')
+            
+            # Choose emoji based on status
+            emoji = _STATUS_STYLE.get(status, _STATUS_STYLE['valid'])[0]
+            
+            status_text = f"{emoji} {status.upper()}"
+            if days is not None:
+                status_text += f" ({days} days)"
+            
+            yield section(f"*{cert_name}*: {status_text}")
+    
+    @staticmethod
+    def _recommendation_section(recommendations: Optional[List[str]]) -> Iterator[Dict[str, Any]]:
+        """Yield the top 5 recommendations, if any."""
+        if not recommendations:
+            return
         
-        # Add timestamp and footer
-        blocks.append({"type": "divider"})
-        blocks.append({
+        yield _DIVIDER
+        yield SlackFormatter._section("*💡 Recommendations:*")
+        for rec in islice(recommendations, 5):  # Show top 5
+            yield SlackFormatter._section(f"• {rec}")
+    
+    @staticmethod
+    def _footer_blocks(now: Optional[time.struct_time] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the timestamp footer."""
+        completed_at = time.strftime('%Y-%m-%d %H:%M:%S UTC', now or time.gmtime())
+        yield _DIVIDER
+        yield {
             "type": "context",
             "elements": [
                 {
                     "type": "mrkdwn",
-                    "text": f"⏰ Scan completed: {time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())} | 📄 Full HTML report attached below"
+                    "text": f"⏰ Scan completed: {completed_at} | 📄 Full HTML report attached below"
                 }
             ]
-        })
-        
-        return blocks
+        }
     
     @staticmethod
     def create_test_blocks() -> List[Dict[str, Any]]:
         """Create blocks for test messages."""
-        return [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "🔐 Kubernetes Certificate Health Check Test"
-                }
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": "*Test Status:*\n✅ Connection Working"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": "*Bot Status:*\n🤖 Ready for certificate scanning"
-                    }
-                ]
-            },
-            {
-                "type": "divider"
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "This is a *test message* to verify the Kubernetes certificate health check Slack integration is working correctly! 🎉"
-                }
-            }
-        ]
+        return list(_TEST_BLOCKS)
     
     @staticmethod
     def format_json_data(data: Dict[str, Any], title: str = "Data Export") -> List[Dict[str, Any]]:
         """Format structured data as JSON blocks."""
+        if ORJSON_AVAILABLE:
+            json_text = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        else:
+            json_text = json.dumps(data, indent=2)
+        
         blocks = [
             {
                 "type": "header",
@@ -248,7 +269,7 @@ class SlackFormatter:
                 "type": "section",
                 "text": {
                     "type": "mrkdwn",
-                    "text": f"```json\n{json.dumps(data, indent=2)}\n```"
+                    "text": f"```json\n{json_text}\n```"
                 }
             }
         ]
@@ -5,34 +5,112 @@ Handles sending certificate scan results to Slack with proper formatting.
 """
 
 import os
+import gzip
 import json
+import shutil
 import time
 import logging
-from typing import Optional, Dict, Any
+import threading
+from functools import cache
+from typing import TYPE_CHECKING, Optional, Dict, Any, Tuple
 from pathlib import Path
 
 from .client import SlackClient
 from .formatter import SlackFormatter
-from utils.html_report import HTMLReportGenerator
+from utils import Config
+
+if TYPE_CHECKING:
+    from certs_analyzer import CertificateAnalyzer
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
+# The analyzer and HTML report modules are only needed once scan output arrives,
+# so they are imported on first use rather than when the notifier starts
+
+@cache
+def _certificate_analyzer_class():
+    """Import and return the CertificateAnalyzer class."""
+    from certs_analyzer import CertificateAnalyzer
+    return CertificateAnalyzer
+
+
+@cache
+def _html_report_generator():
+    """Import and return a shared HTMLReportGenerator."""
+    from utils.html_report import HTMLReportGenerator
+    return HTMLReportGenerator()
+
+
+# Seconds between directory checks when no filesystem watcher is available
+POLL_INTERVAL = 2
+
+# Safety-net rescan interval while waiting on filesystem events, in seconds
+WATCH_RESCAN_INTERVAL = 30
+
+
+class _ScanOutputHandler(FileSystemEventHandler):
+    """Wakes the scan monitor when JSON files in the output directory change."""
+    
+    def __init__(self):
+        super().__init__()
+        self.changed = threading.Event()
+    
+    def on_any_event(self, event) -> None:
+        if event.is_directory:
+            return
+        path = getattr(event, 'dest_path', '') or event.src_path
+        if not str(path).endswith('.json'):
+            return
+        
+        # Opens and read-only closes (including our own reads) change nothing
+        if event.event_type in ('created', 'modified', 'moved', 'closed'):
+            self.changed.set()
+    
+    def wait(self, timeout: float) -> None:
+        """Block until a change event arrives (since the last clear) or timeout elapses."""
+        self.changed.wait(timeout)
+
+
 class SlackNotifier:
     """Handles sending certificate scan results to Slack."""
     
-    def __init__(self, client: SlackClient):
+    def __init__(self, client: SlackClient, analyzer: Optional['CertificateAnalyzer'] = None,
+                 compress_html: bool = False):
         """
         Initialize the Slack notifier.
         
         Args:
             client: SlackClient instance for API interactions
+            analyzer: CertificateAnalyzer for scan results (optional, created from
+                Config on first use)
+            compress_html: Gzip HTML reports before uploading them
         """
         self.client = client
+        self.compress_html = compress_html
         self.formatter = SlackFormatter()
+        self._analyzer = analyzer
+        # (path, mtime_ns, size) -> (scan data, analysis) for processed scan files
+        self._analysis_cache = {}
     
     def send_certificate_report(self, scan_data: Dict[str, Any], analysis: Dict[str, Any] = None,
-                               channel: Optional[str] = None) -> Dict[str, Any]:
+                               channel: Optional[str] = None,
+                               now: Optional[time.struct_time] = None) -> Dict[str, Any]:
         """
         Send a formatted certificate health report to Slack.
         
@@ -41,6 +119,7 @@ class SlackNotifier:
             analysis: Certificate analysis results (optional)
             channel: Channel to send to (defaults to DEFAULT_CHANNEL)
             include_ai: Whether to include AI analysis (requires OpenAI API key)
+            now: Report time as a UTC struct_time (defaults to the current time)
         
         Returns:
             Response from Slack API
@@ -49,10 +128,11 @@ class SlackNotifier:
         summary = self.formatter.parse_certificate_summary(scan_data)
         
         # Create rich blocks for the report
-        blocks = self.formatter.create_certificate_blocks(summary, analysis)
+        blocks = self.formatter.create_certificate_blocks(summary, analysis, now)
         
         # Create fallback text
-        fallback_text = f"🔐 Kubernetes Certificate Health Check - {summary['total_certificates']} certificates, {summary['expired']} expired, {summary['expiring_soon']} expiring soon"
+        total, expired, soon = summary['total_certificates'], summary['expired'], summary['expiring_soon']
+        fallback_text = f"🔐 Kubernetes Certificate Health Check - {total} certificates, {expired} expired, {soon} expiring soon"
         
         try:
             response = self.client.send_rich_message(
@@ -136,77 +216,56 @@ class SlackNotifier:
         
         logger.info(f"Monitoring certificate scan output directory: {output_dir}")
         
-        # Wait for scan results
+        # Wait for scan results; use filesystem events when watchdog is available
+        watcher = self._start_output_watcher(output_path)
         start_time = time.time()
         last_file_found = None
         
-        while time.time() - start_time < max_wait_time:
-            # Look for JSON output files
-            json_files = list(output_path.glob("*.json"))
-            
-            if json_files:
-                # Process the most recent JSON file
-                latest_file = max(json_files, key=lambda f: f.stat().st_mtime)
+        try:
+            while time.time() - start_time < max_wait_time:
+                # Events arriving from here on wake the next wait
+                if watcher:
+                    watcher[1].changed.clear()
                 
-                # Only log once when we first find the file
-                if latest_file != last_file_found:
-                    logger.info(f"Found certificate scan output file: {latest_file}")
-                    last_file_found = latest_file
+                # Look for the most recent JSON output file
+                latest_file = self._latest_json_file(output_path)
                 
-                # Check if file is complete (size stable for 3 seconds)
-                try:
-                    initial_size = latest_file.stat().st_size
-                    if initial_size == 0:
-                        logger.debug("File is empty, waiting...")
-                        time.sleep(2)
-                        continue
-                    
-                    # Wait and check if size is stable
-                    time.sleep(3)
-                    final_size = latest_file.stat().st_size
+                if latest_file:
+                    # Only log once when we first find the file
+                    if latest_file != last_file_found:
+                        logger.info(f"Found certificate scan output file: {latest_file}")
+                        last_file_found = latest_file
                     
-                    if initial_size == final_size:
-                        logger.info("File appears complete, processing...")
+                    # save_results() writes '<name>.json.tmp' and renames it into place, so
+                    # a '*.json' file is complete once it exists; a file that still fails to
+                    # parse (e.g. from a non-atomic writer) is retried below
+                    try:
+                        if latest_file.stat().st_size == 0:
+                            logger.debug("File is empty, waiting...")
+                            self._wait_for_output(watcher, start_time + max_wait_time)
+                            continue
+                        
+                        logger.info("Processing certificate scan output...")
                         
                         try:
-                            with open(latest_file, 'r') as f:
-                                scan_data = json.load(f)
-                            
-                            # Analyze results
-                            from certs_analyzer import CertificateAnalyzer
-                            from utils import Config
-                            
-                            # Initialize analyzer with OpenAI if enabled
-                            config = Config()
-                            if config.is_openai_enabled():
-                                analyzer = CertificateAnalyzer(
-                                    openai_api_key=config.get_openai_api_key(),
-                                    openai_model=config.get_openai_model()
-                                )
-                                logger.info("🤖 AI-powered certificate analysis enabled")
-                            else:
-                                analyzer = CertificateAnalyzer()
-                            
-                            analysis = analyzer.analyze_results(scan_data)
+                            scan_data, analysis = self._load_and_analyze(latest_file)
                             
-                            # Send the formatted report
-                            self.send_certificate_report(scan_data, analysis, channel)
+                            # Send the formatted report; the HTML report shares its timestamp
+                            now = time.gmtime()
+                            self.send_certificate_report(scan_data, analysis, channel, now)
                             
-                            # Generate HTML report
-                            logger.info("📊 Generating HTML report...")
+                            # Generate and upload the HTML report
                             try:
-                                timestamp = time.strftime('%Y%m%d-%H%M%S', time.gmtime())
-                                html_path = output_path / f"certificate-report-{timestamp}.html"
+                                html_path, timestamp = self._write_html_report(scan_data, analysis, output_path, now)
+                                title = f"Certificate Health Report - {timestamp}"
+                                if html_path.suffix == '.gz':
+                                    title += " (gzipped)"
                                 
-                                html_generator = HTMLReportGenerator()
-                                html_generator.generate_certificate_report(scan_data, analysis, str(html_path))
-                                
-                                # Upload the HTML report
                                 logger.info("📤 Uploading HTML report...")
                                 self.client.upload_file(
                                     file_path=str(html_path),
                                     channel=channel,
-                                    title=f"Certificate Health Report - {timestamp}",
+                                    title=title,
                                     initial_comment="🎨 Interactive HTML report with all certificate details - Download and open in your browser!"
                                 )
                                 logger.info("✅ HTML report uploaded successfully!")
@@ -225,24 +284,169 @@ class SlackNotifier:
                         except json.JSONDecodeError as e:
                             logger.error(f"Invalid JSON in certificate scan output: {e}")
                             logger.info("File may still be writing, waiting...")
-                            time.sleep(2)
+                            self._wait_for_output(watcher, start_time + max_wait_time)
                             continue
                         except Exception as e:
                             logger.error(f"Error processing certificate scan output: {e}")
                             # Send error notification
                             self.client.send_message(f"❌ Error processing certificate scan results: {str(e)}", channel)
                             return False
-                    else:
-                        logger.debug(f"File still being written (size changed from {initial_size} to {final_size}), waiting...")
-                        
-                except Exception as e:
-                    logger.error(f"Error checking file: {e}")
-                    time.sleep(2)
-                    continue
+                    except Exception as e:
+                        logger.error(f"Error checking file: {e}")
+                        self._wait_for_output(watcher, start_time + max_wait_time)
+                        continue
+                
+                self._wait_for_output(watcher, start_time + max_wait_time)
             
-            time.sleep(2)  # Check every 2 seconds
+        finally:
+            if watcher:
+                observer, _ = watcher
+                observer.stop()
+                observer.join()
         
         logger.warning(f"⚠️ No complete certificate scan output found after {max_wait_time} seconds")
         self.client.send_message("⚠️ Certificate scan timed out - no results found", channel)
         return False
-
+    
+    def _get_analyzer(self) -> 'CertificateAnalyzer':
+        """
+        Get the certificate analyzer, creating it from Config on first use.
+        
+        Returns:
+            CertificateAnalyzer instance
+        """
+        if self._analyzer is None:
+            # Initialize analyzer with OpenAI if enabled
+            CertificateAnalyzer = _certificate_analyzer_class()
+            config = Config()
+            if config.is_openai_enabled():
+                self._analyzer = CertificateAnalyzer(
+                    openai_api_key=config.get_openai_api_key(),
+                    openai_model=config.get_openai_model()
+                )
+                logger.info("🤖 AI-powered certificate analysis enabled")
+            else:
+                self._analyzer = CertificateAnalyzer()
+        
+        return self._analyzer
+    
+    def _load_and_analyze(self, scan_file: Path) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Load a scan results file and analyze it, reusing earlier results for an unchanged file.
+        
+        Args:
+            scan_file: Path to the JSON scan results
+        
+        Returns:
+            Tuple of (scan data, analysis)
+        """
+        stat = scan_file.stat()
+        key = (str(scan_file), stat.st_mtime_ns, stat.st_size)
+        cached = self._analysis_cache.get(key)
+        if cached is not None:
+            logger.info("Reusing analysis for unchanged scan output")
+            return cached
+        
+        if ORJSON_AVAILABLE:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            with open(scan_file, 'rb') as f:
+                scan_data = orjson.loads(f.read())
+        else:
+            with open(scan_file, 'r') as f:
+                scan_data = json.load(f)
+        
+        # Analyze results
+        analysis = self._get_analyzer().analyze_results(scan_data)
+        
+        self._analysis_cache[key] = (scan_data, analysis)
+        return scan_data, analysis
+    
+    def _latest_json_file(self, output_path: Path) -> Optional[Path]:
+        """
+        Find the most recently modified JSON file in a directory.
+        
+        Args:
+            output_path: Directory to search
+        
+        Returns:
+            Path of the newest *.json file, or None if there is none
+        """
+        try:
+            with os.scandir(output_path) as entries:
+                latest = max(
+                    (entry for entry in entries if entry.name.endswith('.json') and entry.is_file()),
+                    key=lambda entry: entry.stat().st_mtime,
+                    default=None
+                )
+        except FileNotFoundError:
+            return None
+        
+        return Path(latest.path) if latest else None
+    
+    def _write_html_report(self, scan_data: Dict[str, Any], analysis: Dict[str, Any],
+                           output_path: Path, now: Optional[time.struct_time] = None) -> Tuple[Path, str]:
+        """
+        Generate the HTML report for a scan in the output directory.
+        
+        Args:
+            scan_data: Certificate scan results
+            analysis: Certificate analysis results
+            output_path: Directory to write the report to
+            now: Report time as a UTC struct_time (defaults to the current time)
+        
+        Returns:
+            Tuple of (path of the file to upload, timestamp used in its name)
+        """
+        logger.info("📊 Generating HTML report...")
+        timestamp = time.strftime('%Y%m%d-%H%M%S', now or time.gmtime())
+        html_path = output_path / f"certificate-report-{timestamp}.html"
+        
+        _html_report_generator().generate_certificate_report(
+            scan_data, analysis, str(html_path), return_html=False
+        )
+        
+        if self.compress_html:
+            # The report is mostly repeated markup and shrinks several times over
+            gz_path = html_path.with_name(html_path.name + '.gz')
+            with open(html_path, 'rb') as src, gzip.open(gz_path, 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst)
+            return gz_path, timestamp
+        
+        return html_path, timestamp
+    
+    def _start_output_watcher(self, output_path: Path):
+        """
+        Start watching the scan output directory for file events.
+        
+        Args:
+            output_path: Directory to watch
+        
+        Returns:
+            Tuple of (Observer, _ScanOutputHandler), or None to fall back to polling
+        """
+        if not WATCHDOG_AVAILABLE:
+            return None
+        
+        try:
+            handler = _ScanOutputHandler()
+            observer = Observer()
+            observer.schedule(handler, str(output_path), recursive=False)
+            observer.start()
+            logger.info("👀 Watching for scan output with filesystem events")
+            return observer, handler
+        except Exception as e:
+            logger.warning(f"⚠️ Could not start filesystem watcher, polling instead: {e}")
+            return None
+    
+    def _wait_for_output(self, watcher, deadline: float) -> None:
+        """
+        Wait before re-checking the output directory.
+        
+        Args:
+            watcher: Result of _start_output_watcher()
+            deadline: time.time() value after which monitoring gives up
+        """
+        if watcher:
+            watcher[1].wait(max(0, min(WATCH_RESCAN_INTERVAL, deadline - time.time())))
+        else:
+            time.sleep(POLL_INTERVAL)
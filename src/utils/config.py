@@ -6,9 +6,32 @@ Handles application configuration from YAML files and environment variables.
 
 import os
 import yaml
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from pathlib import Path
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+@lru_cache(maxsize=4)
+def _load_yaml(path: str, mtime: float) -> Dict[str, Any]:
+    """
+    Parse a YAML file, cached until its modification time changes.
+    
+    Args:
+        path: Path to the YAML file
+        mtime: Modification time of the file (cache key only)
+        
+    Returns:
+        Parsed YAML data (empty dict for an empty file)
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader) or {}
+
 
 class Config:
     """Application configuration manager."""
@@ -39,8 +62,7 @@ class Config:
         # Try to load from YAML file
         if config_found:
             try:
-                with open(config_found, 'r') as f:
-                    self.config_data = yaml.safe_load(f) or {}
+                self.config_data = _load_yaml(config_found, os.stat(config_found).st_mtime)
                 print(f"✅ Loaded configuration from {config_found}")
                 self.config_file = config_found
             except Exception as e:
@@ -52,6 +74,7 @@ class Config:
         self.slack_bot_token = self._get_value(['slack', 'bot_token'], 'SLACK_BOT_TOKEN')
         self.slack_channel = self._get_value(['slack', 'channel'], 'SLACK_CHANNEL', '#kube-certs')
         self.slack_default_channel = self._get_value(['slack', 'default_channel'], 'DEFAULT_CHANNEL', '#general')
+        self.slack_compress_html = self._get_value(['slack', 'compress_html'], 'SLACK_COMPRESS_HTML', 'false').lower() == 'true'
         self.cert_base_path = self._get_value(['kubernetes', 'cert_base_path'], 'CERT_BASE_PATH', '/etc/kubernetes/pki')
         self.output_dir = self._get_value(['kubernetes', 'output_dir'], 'CERT_SCAN_OUTPUT_DIR', '/tmp/cert-scan-results')
         self.max_wait_time = int(self._get_value(['kubernetes', 'max_wait_time'], 'MAX_WAIT_TIME', '300'))
@@ -65,7 +88,7 @@ class Config:
         # OpenAI config
         self.openai_api_key = self._get_value(['openai', 'api_key'], 'OPENAI_API_KEY', None)
         self.openai_enabled = self._get_value(['openai', 'enabled'], 'OPENAI_ENABLED', 'true').lower() == 'true'
-        self.openai_model = self._get_value(['openai', 'model'], 'OPENAI_MODEL', 'gpt-4')
+        self.openai_model = self._get_value(['openai', 'model'], 'OPENAI_MODEL', 'gpt-4o-mini')
         
         # App config
         self.debug = self._get_value(['app', 'debug'], 'DEBUG', 'false').lower() == 'true'
@@ -113,6 +136,10 @@ class Config:
         """Get Slack channel."""
         return self.slack_channel
     
+    def is_html_compression_enabled(self) -> bool:
+        """Check if HTML reports are gzipped before upload."""
+        return self.slack_compress_html
+    
     def get_cert_base_path(self) -> str:
         """Get certificate base path."""
         return self.cert_base_path
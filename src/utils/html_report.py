@@ -5,98 +5,109 @@ Converts certificate scan results into a beautiful HTML report.
 """
 
 import json
+import re
 import time
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Iterator, Optional
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-class HTMLReportGenerator:
-    """Generates HTML reports from certificate scan data."""
-    
-    @staticmethod
-    def generate_certificate_report(scan_data: Dict[str, Any], analysis: Dict[str, Any] = None,
-                                   output_path: str = None) -> str:
-        """
-        Generate a styled HTML report from certificate scan data.
-        
-        Args:
-            scan_data: Certificate scan results
-            analysis: Certificate analysis results (optional)
-            output_path: Optional path to save the HTML file
-            
-        Returns:
-            HTML content as string
-        """
-        summary = scan_data.get('summary', {})
-        certificates = scan_data.get('certificates', [])
-        
-        total_certs = summary.get('total_certificates', 0)
-        expired = summary.get('expired', 0)
-        expiring_soon = summary.get('expiring_soon', 0)
-        valid = summary.get('valid', 0)
-        
-        # Determine overall status
-        if expired > 0:
-            status = "CRITICAL"
-            status_color = "#ef4444"
-        elif expiring_soon > 0:
-            status = "WARNING"
-            status_color = "#f59e0b"
-        else:
-            status = "HEALTHY"
-            status_color = "#10b981"
-        
-        # Generate HTML
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Kubernetes Certificate Health Report - {time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())}</title>
-    <style>
-        * {{
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Write buffer for streaming reports to disk
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# zstd level for .zst reports; a good CPU/ratio trade for repetitive HTML
+_ZSTD_LEVEL = 3
+
+# Report output directory most recently created or confirmed; reports are
+# normally written to one directory, so a single entry is all that is needed
+_known_output_dir = None
+
+# Numbered point marker in AI use case text, e.g. "1. "
+_NUMBERED_POINT_RE = re.compile(r'(\d+\.\s+)')
+
+# HTML special characters and their entities, applied with str.translate
+_HTML_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#39;',
+})
+
+# Same escaping, also flattening line breaks to spaces (for use case text)
+_HTML_ESCAPE_FLAT = {**_HTML_ESCAPE, ord('\n'): ' ', ord('\r'): ' '}
+
+# Overall report status and banner color, keyed by (any expired, any expiring soon)
+_REPORT_STATUS = {
+    (True, True): ("CRITICAL", "#ef4444"),
+    (True, False): ("CRITICAL", "#ef4444"),
+    (False, True): ("WARNING", "#f59e0b"),
+    (False, False): ("HEALTHY", "#10b981"),
+}
+
+# Certificate status -> (card status CSS class, status label)
+_CERT_STATUS_STYLE = {
+    'expired': ('status-expired', 'EXPIRED'),
+    'expiring_soon': ('status-expiring-soon', 'EXPIRING_SOON'),
+    'valid': ('status-valid', 'VALID'),
+}
+
+# Stylesheet and script shared by every report; kept out of the f-string
+# template so they are not re-interpolated on each call.
+_STATIC_CSS = """    <style>
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             padding: 20px;
             line-height: 1.6;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 12px;
             box-shadow: 0 20px 60px rgba(0,0,0,0.3);
             overflow: hidden;
-        }}
+        }
         
-        .header {{
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 40px;
             text-align: center;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
             font-weight: 700;
-        }}
+        }
         
-        .header .timestamp {{
+        .header .timestamp {
             opacity: 0.9;
             font-size: 0.9em;
-        }}
+        }
         
-        .status-banner {{
-            background: {status_color};
+        .status-banner {
             color: white;
             padding: 30px;
             text-align: center;
@@ -104,78 +115,78 @@ class HTMLReportGenerator:
             font-weight: bold;
             text-transform: uppercase;
             letter-spacing: 2px;
-        }}
+        }
         
-        .summary {{
+        .summary {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             padding: 40px;
             background: #f9fafb;
-        }}
+        }
         
-        .summary-card {{
+        .summary-card {
             background: white;
             padding: 25px;
             border-radius: 8px;
             box-shadow: 0 2px 8px rgba(0,0,0,0.1);
             text-align: center;
             transition: transform 0.2s;
-        }}
+        }
         
-        .summary-card:hover {{
+        .summary-card:hover {
             transform: translateY(-5px);
             box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-        }}
+        }
         
-        .summary-card .number {{
+        .summary-card .number {
             font-size: 3em;
             font-weight: bold;
             margin: 10px 0;
-        }}
+        }
         
-        .summary-card .label {{
+        .summary-card .label {
             color: #6b7280;
             font-size: 0.9em;
             text-transform: uppercase;
             letter-spacing: 1px;
-        }}
+        }
         
-        .valid {{ color: #10b981; }}
-        .expired {{ color: #ef4444; }}
-        .expiring {{ color: #f59e0b; }}
-        .total {{ color: #3b82f6; }}
+        .valid { color: #10b981; }
+        .expired { color: #ef4444; }
+        .expiring { color: #f59e0b; }
+        .total { color: #3b82f6; }
         
-        .content {{
+        .content {
             padding: 40px;
-        }}
+        }
         
-        .section {{
+        .section {
             margin-bottom: 40px;
-        }}
+        }
         
-        .section h2 {{
+        .section h2 {
             color: #1f2937;
             font-size: 1.8em;
             margin-bottom: 20px;
             padding-bottom: 10px;
             border-bottom: 3px solid #667eea;
-        }}
+        }
         
-        .certificate {{
+        .certificate {
             background: white;
             border: 1px solid #e5e7eb;
             border-radius: 8px;
             margin-bottom: 20px;
             overflow: hidden;
             transition: all 0.3s;
-        }}
+        }
         
-        .certificate:hover {{
+        .certificate:hover {
             box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        }}
+        }
         
-        .certificate-header {{
+        .certificate-header {
             background: #f9fafb;
             padding: 20px;
             cursor: pointer;
@@ -183,104 +194,104 @@ class HTMLReportGenerator:
             justify-content: space-between;
             align-items: center;
             border-bottom: 1px solid #e5e7eb;
-        }}
+        }
         
-        .certificate-header:hover {{
+        .certificate-header:hover {
             background: #f3f4f6;
-        }}
+        }
         
-        .certificate-title {{
+        .certificate-title {
             font-size: 1.2em;
             font-weight: 600;
             color: #1f2937;
-        }}
+        }
         
-        .certificate-status {{
+        .certificate-status {
             padding: 5px 15px;
             border-radius: 20px;
             font-weight: 600;
             font-size: 0.9em;
-        }}
+        }
         
-        .status-expired {{
+        .status-expired {
             background: #fee2e2;
             color: #991b1b;
-        }}
+        }
         
-        .status-expiring {{
+        .status-expiring {
             background: #fef3c7;
             color: #92400e;
-        }}
+        }
         
-        .status-valid {{
+        .status-valid {
             background: #d1fae5;
             color: #065f46;
-        }}
+        }
         
-        .certificate-body {{
+        .certificate-body {
             display: none;
             padding: 20px;
-        }}
+        }
         
-        .certificate.expanded .certificate-body {{
+        .certificate.expanded .certificate-body {
             display: block;
-        }}
+        }
         
-        .certificate.expanded .certificate-header {{
+        .certificate.expanded .certificate-header {
             background: #667eea;
             color: white;
-        }}
+        }
         
-        .certificate.expanded .certificate-title {{
+        .certificate.expanded .certificate-title {
             color: white;
-        }}
+        }
         
-        .cert-detail {{
+        .cert-detail {
             background: #f9fafb;
             padding: 15px;
             margin-bottom: 10px;
             border-left: 4px solid #667eea;
             border-radius: 4px;
-        }}
+        }
         
-        .cert-detail strong {{
+        .cert-detail strong {
             color: #1f2937;
             display: block;
             margin-bottom: 5px;
-        }}
+        }
         
-        .cert-detail .value {{
+        .cert-detail .value {
             color: #4b5563;
             font-family: 'Courier New', monospace;
-        }}
+        }
         
-        .issue {{
+        .issue {
             background: #fef2f2;
             padding: 12px;
             border-left: 4px solid #ef4444;
             border-radius: 4px;
             margin-top: 10px;
             color: #991b1b;
-        }}
+        }
         
-        .recommendation {{
+        .recommendation {
             background: #eff6ff;
             padding: 12px;
             border-left: 4px solid #3b82f6;
             border-radius: 4px;
             margin-top: 10px;
             color: #1e40af;
-        }}
+        }
         
-        .footer {{
+        .footer {
             background: #f9fafb;
             padding: 30px;
             text-align: center;
             color: #6b7280;
             border-top: 1px solid #e5e7eb;
-        }}
+        }
         
-        .btn-expand {{
+        .btn-expand {
             background: #667eea;
             color: white;
             border: none;
@@ -289,21 +300,226 @@ class HTMLReportGenerator:
             cursor: pointer;
             font-weight: 600;
             margin: 20px 0;
-        }}
+        }
         
-        .btn-expand:hover {{
+        .btn-expand:hover {
             background: #5568d3;
-        }}
+        }
     </style>
-</head>
+"""
+
+_STATIC_JS = """    <script>
+        function toggleCertificate(element) {
+            element.parentElement.classList.toggle('expanded');
+        }
+        
+        function toggleAll() {
+            const certificates = document.querySelectorAll('.certificate');
+            const allExpanded = Array.from(certificates).every(c => c.classList.contains('expanded'));
+            certificates.forEach(c => {
+                if (allExpanded) {
+                    c.classList.remove('expanded');
+                } else {
+                    c.classList.add('expanded');
+                }
+            });
+        }
+    </script>
+"""
+
+
+# Collapsible card for one certificate, filled with %-formatting:
+# name, status class, status text, path, subject, issuer, not before,
+# not after, SAN, use case and issues HTML
+_CERT_TEMPLATE = """
+            <div class="certificate">
+                <div class="certificate-header" onclick="toggleCertificate(this)">
+                    <div class="certificate-title">%s</div>
+                    <div class="certificate-status %s">%s</div>
+                </div>
+                <div class="certificate-body">
+                    <div class="cert-detail">
+                        <strong>Path:</strong>
+                        <div class="value">%s</div>
+                    </div>
+                    <div class="cert-detail">
+                        <strong>Subject:</strong>
+                        <div class="value">%s</div>
+                    </div>
+                    <div class="cert-detail">
+                        <strong>Issuer:</strong>
+                        <div class="value">%s</div>
+                    </div>
+                    <div class="cert-detail">
+                        <strong>Validity:</strong>
+                        <div class="value">
+                            Not Before: %s<br>
+                            Not After: %s
+                        </div>
+                    </div>
+                    %s
+                    %s
+                    %s
+                </div>
+            </div>
+            """
+
+
+def _open_output(path: Path, mode: str, **kwargs):
+    """
+    Open a report output file, creating its parent directory if needed.
+    
+    The directory is only created when it differs from the last one written
+    to. If a remembered directory has since been removed, it is recreated
+    and the open retried once.
+    
+    Args:
+        path: Output file path
+        mode: File mode, as for open()
+        **kwargs: Further open() arguments
+        
+    Returns:
+        Open file object
+    """
+    global _known_output_dir
+    
+    parent = path.parent
+    if parent != _known_output_dir:
+        parent.mkdir(parents=True, exist_ok=True)
+        _known_output_dir = parent
+    
+    try:
+        return open(path, mode, **kwargs)
+    except FileNotFoundError:
+        parent.mkdir(parents=True, exist_ok=True)
+        return open(path, mode, **kwargs)
+
+
+def _write_zstd(path: Path, chunks: Iterable[str]) -> None:
+    """
+    Write report fragments to a zstd-compressed file.
+    
+    Args:
+        path: Output file path
+        chunks: HTML fragments to compress, in order
+    """
+    if not ZSTD_AVAILABLE:
+        raise ImportError("zstandard library not available. Install with: pip install zstandard")
+    
+    compressor = zstd.ZstdCompressor(level=_ZSTD_LEVEL)
+    with _open_output(path, 'wb') as f, compressor.stream_writer(f) as writer:
+        for chunk in chunks:
+            writer.write(chunk.encode('utf-8'))
+
+
+def _escape(value: Any) -> str:
+    """Escape a value for interpolation into HTML text or attribute values."""
+    return str(value).translate(_HTML_ESCAPE)
+
+
+def _dumps_indented(obj: Any) -> str:
+    """Serialize an object as JSON with 2-space indentation, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+@lru_cache(maxsize=256)
+def _dump_name_items(items: tuple) -> str:
+    """Render a subject/issuer name, given as a tuple of items, as escaped indented JSON."""
+    return _escape(_dumps_indented(dict(items)))
+
+
+def _dump_name(name: Dict[str, Any]) -> str:
+    """
+    Render a subject/issuer name as HTML-escaped indented JSON.
+    
+    Certificates in a cluster mostly share a handful of issuers and subjects,
+    so the rendering is memoized on the name's items (in their original order).
+    
+    Args:
+        name: Subject or issuer dictionary
+        
+    Returns:
+        JSON string with 2-space indentation
+    """
+    try:
+        return _dump_name_items(tuple(name.items()))
+    except (TypeError, AttributeError):
+        # Unhashable values (e.g. multi-valued attributes as lists) or no name
+        return _escape(_dumps_indented(name))
+
+
+class HTMLReportGenerator:
+    """Generates HTML reports from certificate scan data."""
+    
+    @staticmethod
+    def generate_certificate_report(scan_data: Dict[str, Any], analysis: Dict[str, Any] = None,
+                                   output_path: str = None, return_html: bool = True) -> Optional[str]:
+        """
+        Generate a styled HTML report from certificate scan data.
+        
+        Args:
+            scan_data: Certificate scan results
+            analysis: Certificate analysis results (optional)
+            output_path: Optional path to save the HTML file; a path ending in
+                '.zst' is written zstd-compressed (requires zstandard)
+            return_html: If False and output_path is set, stream the report to the
+                file without building it in memory and return None
+            
+        Returns:
+            HTML content as string, or None when streamed to output_path only
+        """
+        chunks = HTMLReportGenerator._render_report(scan_data, analysis)
+        html = "".join(chunks) if return_html or not output_path else None
+        
+        if output_path:
+            output_file = Path(output_path)
+            if output_file.suffix == '.zst':
+                _write_zstd(output_file, chunks if html is None else (html,))
+            elif html is not None:
+                with _open_output(output_file, 'wb') as f:
+                    f.write(html.encode('utf-8'))
+            else:
+                with _open_output(output_file, 'w', encoding='utf-8', newline='',
+                                  buffering=_WRITE_BUFFER_SIZE) as f:
+                    f.writelines(chunks)
+        
+        return html
+    
+    @staticmethod
+    def _render_report(scan_data: Dict[str, Any], analysis: Optional[Dict[str, Any]]) -> Iterator[str]:
+        """Yield the HTML report in fragments, one per certificate for the details list."""
+        summary = scan_data.get('summary', {})
+        certificates = scan_data.get('certificates', [])
+        
+        total_certs = summary.get('total_certificates', 0)
+        expired = summary.get('expired', 0)
+        expiring_soon = summary.get('expiring_soon', 0)
+        valid = summary.get('valid', 0)
+        
+        # Determine overall status
+        status, status_color = _REPORT_STATUS[expired > 0, expiring_soon > 0]
+        
+        ts = time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())
+        
+        yield f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Kubernetes Certificate Health Report - {ts}</title>
+"""
+        yield _STATIC_CSS
+        yield f"""</head>
 <body>
     <div class="container">
         <div class="header">
             <h1>🔐 Kubernetes Certificate Health Report</h1>
-            <div class="timestamp">{time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())}</div>
+            <div class="timestamp">{ts}</div>
         </div>
         
-        <div class="status-banner">
+        <div class="status-banner" style="background: {status_color};">
             {status}
         </div>
         
@@ -330,105 +546,68 @@ class HTMLReportGenerator:
             <div class="section">
                 <h2>📋 Certificate Details</h2>
                 <button class="btn-expand" onclick="toggleAll()">Expand/Collapse All</button>
-                {HTMLReportGenerator._generate_certificate_list(certificates)}
+                """
+        yield from map(HTMLReportGenerator._generate_certificate_html, certificates)
+        
+        # Issues and recommendations, leaving out sections with nothing to show
+        extra_sections = "\n            ".join(filter(None, (
+            HTMLReportGenerator._generate_issues_section(analysis),
+            HTMLReportGenerator._generate_recommendations_section(analysis),
+        )))
+        yield f"""
             </div>
             
-            {HTMLReportGenerator._generate_issues_section(analysis) if analysis else ''}
-            {HTMLReportGenerator._generate_recommendations_section(analysis) if analysis else ''}
+            {extra_sections}
         </div>
         
         <div class="footer">
             <p>Generated by Kubernetes Certificate Health Checker</p>
-            <p>Cluster Type: {scan_data.get('cluster_type', 'Unknown')}</p>
+            <p>Cluster Type: {_escape(scan_data.get('cluster_type', 'Unknown'))}</p>
         </div>
     </div>
     
-    <script>
-        function toggleCertificate(element) {{
-            element.parentElement.classList.toggle('expanded');
-        }}
-        
-        function toggleAll() {{
-            const certificates = document.querySelectorAll('.certificate');
-            const allExpanded = Array.from(certificates).every(c => c.classList.contains('expanded'));
-            certificates.forEach(c => {{
-                if (allExpanded) {{
-                    c.classList.remove('expanded');
-                }} else {{
-                    c.classList.add('expanded');
-                }}
-            }});
-        }}
-    </script>
-</body>
+"""
+        yield _STATIC_JS
+        yield """</body>
 </html>"""
-        
-        if output_path:
-            output_file = Path(output_path)
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_file, 'w') as f:
-                f.write(html)
-        
-        return html
     
     @staticmethod
-    def _generate_certificate_list(certificates: list) -> str:
-        """Generate HTML for certificate list."""
-        html = ""
-        for cert in certificates:
-            name = cert.get('name', 'Unknown')
-            status = cert.get('status', 'unknown')
-            days = cert.get('days_until_expiry')
-            path = cert.get('path', '')
-            subject = cert.get('subject', {})
-            issuer = cert.get('issuer', {})
-            validity = cert.get('validity', {})
-            san = cert.get('san', {})
-            issues = cert.get('issues', [])
-            
-            status_class = f"status-{status.replace('_', '-')}"
-            status_text = status.upper()
-            if days is not None:
-                if status == 'expired':
-                    status_text += f" (Expired {abs(days)} days ago)"
-                elif status == 'expiring_soon':
-                    status_text += f" ({days} days remaining)"
-                else:
-                    status_text += f" ({days} days remaining)"
-            
-            html += f"""
-            <div class="certificate">
-                <div class="certificate-header" onclick="toggleCertificate(this)">
-                    <div class="certificate-title">{name}</div>
-                    <div class="certificate-status {status_class}">{status_text}</div>
-                </div>
-                <div class="certificate-body">
-                    <div class="cert-detail">
-                        <strong>Path:</strong>
-                        <div class="value">{path}</div>
-                    </div>
-                    <div class="cert-detail">
-                        <strong>Subject:</strong>
-                        <div class="value">{json.dumps(subject, indent=2)}</div>
-                    </div>
-                    <div class="cert-detail">
-                        <strong>Issuer:</strong>
-                        <div class="value">{json.dumps(issuer, indent=2)}</div>
-                    </div>
-                    <div class="cert-detail">
-                        <strong>Validity:</strong>
-                        <div class="value">
-                            Not Before: {validity.get('not_before', 'N/A')}<br>
-                            Not After: {validity.get('not_after', 'N/A')}
-                        </div>
-                    </div>
-                    {HTMLReportGenerator._generate_san_html(san)}
-                    {HTMLReportGenerator._generate_use_case_html(cert.get('use_case'))}
-                    {HTMLReportGenerator._generate_issues_html(issues)}
-                </div>
-            </div>
-            """
-        return html
+    def _generate_certificate_html(cert: Dict[str, Any]) -> str:
+        """Generate HTML for a single certificate card."""
+        get = cert.get
+        name = get('name', 'Unknown')
+        status = get('status', 'unknown')
+        days = get('days_until_expiry')
+        path = get('path', '')
+        subject = get('subject', {})
+        issuer = get('issuer', {})
+        validity = get('validity', {})
+        san = get('san', {})
+        issues = get('issues', [])
+        
+        style = _CERT_STATUS_STYLE.get(status)
+        if style is None:
+            style = (_escape(f"status-{status.replace('_', '-')}"), _escape(status.upper()))
+        status_class, status_text = style
+        if days is not None:
+            if status == 'expired':
+                status_text += f" (Expired {abs(days)} days ago)"
+            else:
+                status_text += f" ({days} days remaining)"
+        
+        return _CERT_TEMPLATE % (
+            _escape(name),
+            status_class,
+            status_text,
+            _escape(path),
+            _dump_name(subject),
+            _dump_name(issuer),
+            _escape(validity.get('not_before', 'N/A')),
+            _escape(validity.get('not_after', 'N/A')),
+            HTMLReportGenerator._generate_san_html(san),
+            HTMLReportGenerator._generate_use_case_html(get('use_case')),
+            HTMLReportGenerator._generate_issues_html(issues),
+        )
     
     @staticmethod
     def _generate_use_case_html(use_case: Optional[str]) -> str:
@@ -436,27 +615,19 @@ class HTMLReportGenerator:
         if not use_case:
             return ""
         
-        # Format the use case text to handle numbered points properly
-        import re
+        # Replace newlines with spaces and escape in a single pass
+        text = use_case.translate(_HTML_ESCAPE_FLAT).strip()
         
-        # Replace newlines with spaces first to normalize
-        text = use_case.replace('\n', ' ').replace('\r', ' ').strip()
+        # Split by numbered points: "lead 1. text 2. text" becomes
+        # ["lead", "1. ", "text", "2. ", "text"], markers at odd indices
+        parts = _NUMBERED_POINT_RE.split(text)
         
-        # Split by numbered points (pattern: number followed by period and space)
-        # This will split: "1. text 2. text 3. text" into parts
-        parts = re.split(r'(\d+\.\s+)', text)
+        lead = parts[0].strip()
+        points = [f'<strong>{marker}</strong>{body.strip()}'
+                  for marker, body in zip(parts[1::2], parts[2::2])]
         
-        formatted_parts = []
-        for i, part in enumerate(parts):
-            if re.match(r'^\d+\.\s+$', part):
-                # This is a numbered point marker (e.g., "1. ")
-                if formatted_parts:  # Add line break before new point (except first)
-                    formatted_parts.append('<br><br>')
-                formatted_parts.append(f'<strong>{part}</strong>')
-            elif part.strip():  # Only add non-empty text parts
-                formatted_parts.append(part.strip())
-        
-        formatted_text = ''.join(formatted_parts)
+        # Put a line break between the lead text and each numbered point
+        formatted_text = '<br><br>'.join([lead] + points if lead else points)
         
         return f"""
                     <div class="cert-detail" style="background: #eff6ff; border-left: 4px solid #3b82f6;">
@@ -474,13 +645,13 @@ class HTMLReportGenerator:
         if not dns_names and not ip_addresses:
             return ""
         
-        html = '<div class="cert-detail"><strong>Subject Alternative Names:</strong>'
+        parts = ['<div class="cert-detail"><strong>Subject Alternative Names:</strong>']
         if dns_names:
-            html += f'<div class="value">DNS: {", ".join(dns_names)}</div>'
+            parts.append(f'<div class="value">DNS: {_escape(", ".join(dns_names))}</div>')
         if ip_addresses:
-            html += f'<div class="value">IP: {", ".join(ip_addresses)}</div>'
-        html += '</div>'
-        return html
+            parts.append(f'<div class="value">IP: {_escape(", ".join(ip_addresses))}</div>')
+        parts.append('</div>')
+        return "".join(parts)
     
     @staticmethod
     def _generate_issues_html(issues: list) -> str:
@@ -488,10 +659,7 @@ class HTMLReportGenerator:
         if not issues:
             return ""
         
-        html = ""
-        for issue in issues:
-            html += f'<div class="issue">⚠️ {issue}</div>'
-        return html
+        return "".join(f'<div class="issue">⚠️ {_escape(issue)}</div>' for issue in issues)
     
     @staticmethod
     def _generate_issues_section(analysis: Optional[Dict[str, Any]]) -> str:
@@ -505,24 +673,24 @@ class HTMLReportGenerator:
         if not critical_issues and not warnings:
             return ""
         
-        html = '<div class="section"><h2>🚨 Issues & Warnings</h2>'
+        parts = ['<div class="section"><h2>🚨 Issues & Warnings</h2>']
         
         if critical_issues:
-            html += '<h3 style="color: #ef4444; margin-top: 20px;">Critical Issues</h3>'
+            parts.append('<h3 style="color: #ef4444; margin-top: 20px;">Critical Issues</h3>')
             for issue in critical_issues:
                 cert_name = issue.get('certificate', 'Unknown')
                 issue_text = issue.get('issue', '')
-                html += f'<div class="issue">🔴 <strong>{cert_name}:</strong> {issue_text}</div>'
+                parts.append(f'<div class="issue">🔴 <strong>{_escape(cert_name)}:</strong> {_escape(issue_text)}</div>')
         
         if warnings:
-            html += '<h3 style="color: #f59e0b; margin-top: 20px;">Warnings</h3>'
+            parts.append('<h3 style="color: #f59e0b; margin-top: 20px;">Warnings</h3>')
             for warning in warnings:
                 cert_name = warning.get('certificate', 'Unknown')
                 warning_text = warning.get('issue', '')
-                html += f'<div class="issue" style="background: #fffbeb; border-left-color: #f59e0b; color: #92400e;">⚠️ <strong>{cert_name}:</strong> {warning_text}</div>'
+                parts.append(f'<div class="issue" style="background: #fffbeb; border-left-color: #f59e0b; color: #92400e;">⚠️ <strong>{_escape(cert_name)}:</strong> {_escape(warning_text)}</div>')
         
-        html += '</div>'
-        return html
+        parts.append('</div>')
+        return "".join(parts)
     
     @staticmethod
     def _generate_recommendations_section(analysis: Optional[Dict[str, Any]]) -> str:
@@ -534,9 +702,9 @@ class HTMLReportGenerator:
         if not recommendations:
             return ""
         
-        html = '<div class="section"><h2>💡 Recommendations</h2>'
+        parts = ['<div class="section"><h2>💡 Recommendations</h2>']
         for rec in recommendations:
-            html += f'<div class="recommendation">• {rec}</div>'
-        html += '</div>'
-        return html
+            parts.append(f'<div class="recommendation">• {_escape(rec)}</div>')
+        parts.append('</div>')
+        return "".join(parts)
 